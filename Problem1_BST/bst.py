@@ -1,94 +1,623 @@
+import mmap
+import os
+import struct
+import sys
 import tkinter as tk
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import islice
 from tkinter import messagebox
 
 class Node:
     # A node in the binary search tree.
-    def __init__(self, key):
+    # __slots__ drops the per-instance __dict__ (see compact_bst.py for an array-backed layout).
+    __slots__ = ("left", "right", "key", "count", "height", "size")
+
+    def __init__(self, key, count=1):
         self.left = None
         self.right = None
         self.key = key
+        self.count = count  # Copies of key held by this node (always 1 unless multiset=True)
+        self.height = 1  # Height of the subtree rooted here (kept up to date in AVL mode only)
+        self.size = count  # Number of keys in the subtree rooted here, counting copies (for rank/select)
+
+# Balancing strategies accepted by BST(balanced=...)
+BALANCE_MODES = (None, "avl", "splay")
+
+# Snapshot files: a 16-byte header (magic, format version, balancing mode index, multiset flag,
+# key count) followed by every key, duplicates included, in ascending order as little-endian int64.
+SNAPSHOT_MAGIC = b"BST\x00"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_HEADER = struct.Struct("<4sBBBxQ")
+
+def _read_snapshot_header(f):
+    # Read and validate a snapshot header, returning (balanced, multiset, key count).
+    raw = f.read(SNAPSHOT_HEADER.size)
+    if len(raw) != SNAPSHOT_HEADER.size:
+        raise ValueError("Not a BST snapshot: file is too short")
+    magic, version, mode, multiset, count = SNAPSHOT_HEADER.unpack(raw)
+    if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION or mode >= len(BALANCE_MODES):
+        raise ValueError("Not a BST snapshot, or an unsupported snapshot version")
+    return BALANCE_MODES[mode], bool(multiset), count
 
 # A binary search tree with insert, delete, search, and inorder traversal.
+# Pass balanced="avl" to keep the tree height at O(log n) with AVL rotations, or
+# balanced="splay" to move every accessed node to the root so hot keys stay near the top,
+# and multiset=True to store duplicates as a count on one node instead of a chain of nodes.
 class BST:
-    def __init__(self):
+    def __init__(self, balanced=None, multiset=False):
+        if balanced not in BALANCE_MODES:
+            raise ValueError(f"Unknown balancing mode: {balanced!r}")
         self.root = None
+        self.balanced = balanced
+        self.multiset = multiset
+
+    # Build a perfectly balanced tree from keys that are already in ascending order, in O(n).
+    @classmethod
+    def from_sorted(cls, iterable, balanced=None, multiset=False):
+        keys = list(iterable)
+        if any(a > b for a, b in zip(keys, islice(keys, 1, None))):
+            raise ValueError("from_sorted() requires keys in ascending order")
+        tree = cls(balanced=balanced, multiset=multiset)
+        counts = None
+        if multiset:
+            keys, counts = tree._group_runs(keys)
+        tree.root = tree._build_balanced(keys, 0, len(keys), counts)
+        return tree
+
+    # Write the tree to path as a compact binary snapshot (integer keys only).
+    def save(self, path):
+        keys = array("q", self.iter_inorder())
+        if sys.byteorder != "little":
+            keys.byteswap()
+        with open(path, "wb") as f:
+            f.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION,
+                                         BALANCE_MODES.index(self.balanced), self.multiset, len(keys)))
+            keys.tofile(f)
 
-    # Insert a key into the BST. Duplicates go to the right.
+    # Load a snapshot written by save(), rebuilding a perfectly balanced tree in O(n).
+    # With use_mmap=True, return a read-only MappedBST that searches the file in place instead.
+    @classmethod
+    def load(cls, path, use_mmap=False):
+        if use_mmap:
+            return MappedBST(path)
+        with open(path, "rb") as f:
+            balanced, multiset, count = _read_snapshot_header(f)
+            # Check the count against the file before reading, so a corrupt header cannot ask for a huge read
+            if 8 * count > os.fstat(f.fileno()).st_size - SNAPSHOT_HEADER.size:
+                raise ValueError("BST snapshot is truncated")
+            payload = f.read(8 * count)
+        keys = array("q", payload)
+        if sys.byteorder != "little":
+            keys.byteswap()
+        return cls.from_sorted(keys, balanced=balanced, multiset=multiset)
+
+    # Insert a batch of keys at once. The batch is sorted and split down the tree, each
+    # piece becoming a balanced subtree in an empty child slot; in AVL mode, nodes left
+    # unbalanced by this are rotated or rebuilt, so only the affected part of the tree is touched.
+    def bulk_insert(self, keys):
+        batch = sorted(keys)
+        if not batch:
+            return
+        counts = None
+        if self.multiset:
+            batch, counts = self._group_runs(batch)
+        if self.root is None:
+            self.root = self._build_balanced(batch, 0, len(batch), counts)
+            return
+        touched = []  # (node, parent) pairs, parents always before their children
+        stack = [(self.root, None, 0, len(batch))]
+        while stack:
+            node, parent, lo, hi = stack.pop()
+            touched.append((node, parent))
+            mid = bisect_left(batch, node.key, lo, hi)  # batch[lo:mid] < node.key <= batch[mid:hi]
+            if mid > lo:
+                if node.left is None:
+                    node.left = self._build_balanced(batch, lo, mid, counts)
+                else:
+                    stack.append((node.left, node, lo, mid))
+            if counts is not None and mid < hi and batch[mid] == node.key:
+                node.count += counts[mid]  # Multiset: copies of an existing key just raise its count
+                mid += 1
+            if hi > mid:
+                if node.right is None:
+                    node.right = self._build_balanced(batch, mid, hi, counts)
+                else:
+                    stack.append((node.right, node, mid, hi))
+        # Update heights and sizes bottom-up (children before parents) and, in AVL mode, note where
+        # the attached subtrees made a node too lopsided for a single rotation to repair.
+        lopsided = set()
+        for node, _ in reversed(touched):
+            self._update(node)
+            if self.balanced == "avl" and abs(self._height(node.left) - self._height(node.right)) > 2:
+                lopsided.add(id(node))
+        if self.balanced != "avl":
+            return
+        # Rebuild only the topmost lopsided subtrees; anything below them is rebuilt with them.
+        replaced = set()
+        for node, parent in touched:
+            if parent is not None and id(parent) in replaced:
+                replaced.add(id(node))
+            elif id(node) in lopsided:
+                self._rebuild_subtree(node, parent)
+                replaced.add(id(node))
+        # Walk the remaining nodes bottom-up again: small imbalances are fixed with the usual
+        # rotations, and anything a rebuild or rotation left lopsided is rebuilt as well.
+        for node, parent in reversed(touched):
+            if id(node) in replaced:
+                continue
+            self._update(node)
+            if abs(self._height(node.left) - self._height(node.right)) > 2:
+                self._rebuild_subtree(node, parent)
+                continue
+            fixed = self._rebalance(node)
+            if fixed is node:
+                continue
+            if parent is None:
+                self.root = fixed
+            elif parent.left is node:
+                parent.left = fixed
+            else:
+                parent.right = fixed
+
+    def _rebuild_subtree(self, node, parent):
+        # Relink the nodes of the subtree rooted at node into a perfectly balanced shape.
+        nodes = list(self._iter_nodes(node))
+        rebuilt = self._link_balanced(nodes, 0, len(nodes))
+        if parent is None:
+            self.root = rebuilt
+        elif parent.left is node:
+            parent.left = rebuilt
+        else:
+            parent.right = rebuilt
+
+    def _build_balanced(self, keys, lo, hi, counts=None):
+        # Build a balanced subtree of new nodes for keys[lo:hi] (with their counts in multiset mode).
+        if counts is None:
+            nodes = [Node(keys[i]) for i in range(lo, hi)]
+        else:
+            nodes = [Node(keys[i], counts[i]) for i in range(lo, hi)]
+        return self._link_balanced(nodes, 0, len(nodes))
+
+    def _link_balanced(self, nodes, lo, hi):
+        # Link nodes[lo:hi] (in key order) into a balanced subtree rooted at the middle node.
+        if lo >= hi:
+            return None
+        mid = (lo + hi) // 2
+        node = nodes[mid]
+        node.left = self._link_balanced(nodes, lo, mid)
+        node.right = self._link_balanced(nodes, mid + 1, hi)
+        self._update(node)
+        return node
+
+    def _group_runs(self, keys):
+        # Collapse runs of equal keys in a sorted list into parallel (unique keys, counts) lists.
+        unique, counts = [], []
+        for key in keys:
+            if unique and unique[-1] == key:
+                counts[-1] += 1
+            else:
+                unique.append(key)
+                counts.append(1)
+        return unique, counts
+
+    # Insert a key into the BST. Duplicates go to the right (or raise the key's count in multiset mode).
     def insert(self, key):
         self.root = self._insert(self.root, key)
 
     def _insert(self, node, key):
+        # Walk down iteratively, remembering the path so it can be rebalanced afterwards.
         if node is None:
             return Node(key)
-        if key < node.key:
-            node.left = self._insert(node.left, key)
-        else:  # key >= node.key - duplicates go to right
-            node.right = self._insert(node.right, key)
-        return node
+        path = []
+        current = node
+        while current is not None:
+            path.append(current)
+            current.size += 1  # Every insert adds a key below each node on the path
+            if self.multiset and key == current.key:
+                current.count += 1
+                return self._finish_path(path)
+            if key < current.key:
+                current = current.left
+            else:  # key >= current.key - duplicates go to right
+                current = current.right
+        parent = path[-1]
+        new_node = Node(key)
+        if key < parent.key:
+            parent.left = new_node
+        else:
+            parent.right = new_node
+        path.append(new_node)
+        return self._finish_path(path)
 
-    # Delete node with the given key from the BST.
+    # Delete node with the given key from the BST (in multiset mode, one copy of the key).
     def delete(self, key):
         self.root, _ = self._delete(self.root, key)
 
     def _delete(self, node, key):
-        if node is None:
-            return node, False
-        if key < node.key:
-            node.left, deleted = self._delete(node.left, key)
-            return node, deleted
-        elif key > node.key:
-            node.right, deleted = self._delete(node.right, key)
-            return node, deleted
-        else:  # key == node.key - found the node to delete
-            # Case 1: No children - simply remove the node
-            if node.left is None and node.right is None:
-                return None, True
-            # Case 2: One child - replace with the child
-            if node.left is None:
-                return node.right, True
-            elif node.right is None:
-                return node.left, True
-            # Case 3: Two children - replace with inorder successor
-            succ = self._min_value_node(node.right)
-            node.key = succ.key
-            node.right, _ = self._delete(node.right, succ.key)
-            return node, True
-
-    def _min_value_node(self, node):
-        # Find the leftmost node (minimum value) in the subtree.
+        path = []
         current = node
-        while current.left is not None:
-            current = current.left
-        return current
+        while current is not None and key != current.key:
+            path.append(current)
+            current = current.left if key < current.key else current.right
+        if current is None:
+            return node, False
+        if current.count > 1:
+            path.append(current)
+            current.count -= 1
+            return self._finish_path(path, -1), True
+        # Case 3: Two children - copy the inorder successor's key, then remove the successor,
+        # which has no left child and so falls into case 1 or 2 below
+        if current.left is not None and current.right is not None:
+            path.append(current)
+            below = len(path)
+            succ = current.right
+            while succ.left is not None:
+                path.append(succ)
+                succ = succ.left
+            current.key = succ.key
+            current.count = succ.count
+            # Every copy of the successor's key moves up, so the nodes in between lose all of them
+            for node in path[below:]:
+                node.size -= succ.count - 1
+            current = succ
+        # Case 1: No children / Case 2: One child - replace the node with its child (or None)
+        child = current.left if current.left is not None else current.right
+        if not path:
+            return child, True
+        parent = path[-1]
+        if parent.left is current:
+            parent.left = child
+        else:
+            parent.right = child
+        return self._finish_path(path, -1), True
+
+    def _finish_path(self, path, size_change=0):
+        # Update the path after an insert or delete and return the new root. In AVL mode every node
+        # is recomputed and rebalanced; otherwise heights are not kept, so only each size changes
+        # by size_change (inserts count on the way down) and splay mode splays the last node up.
+        if self.balanced == "avl":
+            return self._fix_path(path)
+        if size_change:
+            for node in path:
+                node.size += size_change
+        if self.balanced == "splay":
+            return self._splay(path)
+        return path[0]
+
+    def _fix_path(self, path):
+        # Update (and rebalance) the nodes on a root-to-leaf path, bottom-up, and return the (possibly new) root.
+        for i in range(len(path) - 1, -1, -1):
+            node = path[i]
+            fixed = self._rebalance(node)
+            if i > 0 and fixed is not node:
+                parent = path[i - 1]
+                if parent.left is node:
+                    parent.left = fixed
+                else:
+                    parent.right = fixed
+        return fixed
+
+    def _splay(self, path):
+        # Rotate the last node of a root-to-node path up to the root, two levels at a time
+        # (bottom-up splaying), and return it. Node identities and keys are unchanged.
+        x = path[-1]
+        i = len(path) - 1
+        while i > 0:
+            p = path[i - 1]
+            if i == 1:
+                # Zig: p is the root
+                if p.left is x:
+                    self._rotate_right(p)
+                else:
+                    self._rotate_left(p)
+                break
+            g = path[i - 2]
+            if (g.left is p) == (p.left is x):
+                # Zig-zig: rotate the grandparent first, then the parent
+                if g.left is p:
+                    self._rotate_right(g)
+                    self._rotate_right(p)
+                else:
+                    self._rotate_left(g)
+                    self._rotate_left(p)
+            elif g.left is p:
+                # Zig-zag: x is a right child of a left child (or the mirror image)
+                g.left = self._rotate_left(p)
+                self._rotate_right(g)
+            else:
+                g.right = self._rotate_right(p)
+                self._rotate_left(g)
+            if i >= 3:
+                above = path[i - 3]
+                if above.left is g:
+                    above.left = x
+                else:
+                    above.right = x
+            i -= 2
+        return x
+
+    # --- Subtree bookkeeping and AVL balancing helpers (rotations only happen when balanced="avl") ---
+
+    def _height(self, node):
+        return node.height if node is not None else 0
+
+    def _size(self, node):
+        return node.size if node is not None else 0
+
+    def _update(self, node):
+        # Recompute the node's height and size from its children (inlined: this runs on every rotation).
+        # Heights only matter in AVL mode, so splay rotations refresh the size alone.
+        left, right = node.left, node.right
+        if self.balanced != "avl":
+            node.size = node.count + (left.size if left is not None else 0) + (right.size if right is not None else 0)
+            return
+        left_height, left_size = (left.height, left.size) if left is not None else (0, 0)
+        right_height, right_size = (right.height, right.size) if right is not None else (0, 0)
+        node.height = 1 + (left_height if left_height > right_height else right_height)
+        node.size = node.count + left_size + right_size
+
+    def _rotate_left(self, node):
+        # Lift the right child above node and return it as the new subtree root.
+        pivot = node.right
+        node.right = pivot.left
+        pivot.left = node
+        self._update(node)
+        self._update(pivot)
+        return pivot
+
+    def _rotate_right(self, node):
+        # Lift the left child above node and return it as the new subtree root.
+        pivot = node.left
+        node.left = pivot.right
+        pivot.right = node
+        self._update(node)
+        self._update(pivot)
+        return pivot
+
+    def _rebalance(self, node):
+        # Refresh node's bookkeeping and, in AVL mode, restore the invariant (child heights differ by at most 1).
+        self._update(node)
+        if self.balanced != "avl":
+            return node
+        balance = self._height(node.left) - self._height(node.right)
+        if balance > 1:
+            if self._height(node.left.left) < self._height(node.left.right):
+                node.left = self._rotate_left(node.left)  # Left-right case
+            return self._rotate_right(node)
+        if balance < -1:
+            if self._height(node.right.right) < self._height(node.right.left):
+                node.right = self._rotate_right(node.right)  # Right-left case
+            return self._rotate_left(node)
+        return node
+
+    # Return the number of keys in the tree.
+    def __len__(self):
+        return self._size(self.root)
+
+    # Return how many keys are strictly smaller than key, in O(height).
+    def rank(self, key):
+        return self._count_below(key, inclusive=False)
+
+    # Return the k-th smallest key (0-based), in O(height).
+    def select(self, k):
+        if not 0 <= k < len(self):
+            raise IndexError("select index out of range")
+        node = self.root
+        while True:
+            left_size = self._size(node.left)
+            if k < left_size:
+                node = node.left
+            elif k < left_size + node.count:
+                return node.key
+            else:
+                k -= left_size + node.count
+                node = node.right
+
+    # Return how many keys lie in the closed range [lo, hi], in O(height).
+    def count_range(self, lo, hi):
+        if hi < lo:
+            return 0
+        return self._count_below(hi, inclusive=True) - self._count_below(lo, inclusive=False)
+
+    def _count_below(self, key, inclusive):
+        # Count keys < key (or <= key), adding whole left subtrees whenever the descent turns right.
+        count = 0
+        node = self.root
+        while node is not None:
+            if node.key < key or (inclusive and node.key == key):
+                count += self._size(node.left) + node.count
+                node = node.right
+            else:
+                node = node.left
+        return count
 
     # Search for a value in the BST and return the node with the given key, or None if not found.
     def search(self, key):
+        if self.balanced == "splay":
+            return self._splay_search(key)
         return self._search(self.root, key)
 
+    def _splay_search(self, key):
+        # Search, then splay the found node (or the last node visited on a miss) to the root.
+        path = []
+        node = self.root
+        while node is not None:
+            path.append(node)
+            if key == node.key:
+                break
+            node = node.left if key < node.key else node.right
+        if path:
+            self.root = self._splay(path)
+        return node
+
     def _search(self, node, key):
-        if node is None:
-            return None
-        if key == node.key:
-            return node
-        elif key < node.key:
-            return self._search(node.left, key)
-        else:
-            return self._search(node.right, key)
+        while node is not None:
+            if key == node.key:
+                return node
+            elif key < node.key:
+                node = node.left
+            else:
+                node = node.right
+        return None
 
     # Return a list of keys in sorted (inorder) order.
     def inorder(self):
-        result = []
-        self._inorder_recursive(self.root, result)
-        return result
+        return list(self.iter_inorder())
+
+    # Lazily yield keys in sorted order, holding only O(height) nodes at a time.
+    def iter_inorder(self):
+        return self._iter_subtree(self.root)
+
+    # Lazily yield the keys in the closed range [lo, hi] (None means unbounded), in ascending order,
+    # or descending with reverse=True, stopping after limit keys. Only subtrees that overlap the
+    # range are visited, so a scan costs O(height + k) for k yielded keys.
+    def range(self, lo=None, hi=None, reverse=False, limit=None):
+        yielded = 0
+        stack = []
+        node = self.root
+        while limit is None or yielded < limit:
+            # Descend towards the near end of the range, skipping subtrees that lie entirely outside it.
+            while node is not None:
+                if reverse:
+                    if hi is not None and node.key > hi:
+                        node = node.left
+                    else:
+                        stack.append(node)
+                        node = node.right
+                else:
+                    if lo is not None and node.key < lo:
+                        node = node.right
+                    else:
+                        stack.append(node)
+                        node = node.left
+            if not stack:
+                return
+            node = stack.pop()
+            # Keys only move away from the start from here on, so the first one past the far end stops the scan.
+            if reverse and lo is not None and node.key < lo:
+                return
+            if not reverse and hi is not None and node.key > hi:
+                return
+            copies = node.count if limit is None else min(node.count, limit - yielded)
+            for _ in range(copies):
+                yield node.key
+            yielded += copies
+            node = node.left if reverse else node.right
+
+    def _iter_subtree(self, node):
+        # Yield the keys under node in order, repeating each key count times.
+        for current in self._iter_nodes(node):
+            yield current.key
+            for _ in range(current.count - 1):
+                yield current.key
+
+    def _iter_nodes(self, node):
+        # Yield the nodes under node in key order.
+        stack = []
+        while stack or node is not None:
+            # Go as far left as possible, then visit the node and continue with its right subtree.
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node
+            node = node.right
+
+# A read-only view of a BST snapshot file. The file is memory-mapped and searched by bisection
+# over the sorted key array, so opening it costs O(1) and no Node is ever created.
+class MappedBST:
+    def __init__(self, path):
+        if sys.byteorder != "little":
+            raise ValueError("Memory-mapped snapshots require a little-endian machine")
+        self._file = open(path, "rb")
+        try:
+            self.balanced, self.multiset, count = _read_snapshot_header(self._file)
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if count else None
+            if self._mmap is not None and len(self._mmap) < SNAPSHOT_HEADER.size + 8 * count:
+                self._mmap.close()
+                raise ValueError("BST snapshot is truncated")
+        except Exception:
+            self._file.close()
+            raise
+        # The header is 16 bytes long, so the key array that follows it stays 8-byte aligned.
+        if self._mmap is not None:
+            self._keys = memoryview(self._mmap)[SNAPSHOT_HEADER.size:SNAPSHOT_HEADER.size + 8 * count].cast("q")
+        else:
+            self._keys = memoryview(array("q"))
+
+    def close(self):
+        self._keys.release()
+        if self._mmap is not None:
+            self._mmap.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, key):
+        return self.search(key)
+
+    # Return True if key is in the snapshot.
+    def search(self, key):
+        i = bisect_left(self._keys, key)
+        return i < len(self._keys) and self._keys[i] == key
+
+    def inorder(self):
+        return self._keys.tolist()
+
+    def iter_inorder(self):
+        return iter(self._keys)
+
+    # Same contract as BST.range(): keys in [lo, hi] (None means unbounded), optionally reversed and limited.
+    def range(self, lo=None, hi=None, reverse=False, limit=None):
+        start = 0 if lo is None else bisect_left(self._keys, lo)
+        stop = len(self._keys) if hi is None else bisect_right(self._keys, hi)
+        if limit is not None:
+            if reverse:
+                start = max(start, stop - limit)
+            else:
+                stop = min(stop, start + limit)
+        return self._iter_positions(range(stop - 1, start - 1, -1) if reverse else range(start, stop))
+
+    # Yield keys by index rather than iterating a slice: a slice would pin the mmap with a buffer
+    # export, making close() fail while the iterator is alive.
+    def _iter_positions(self, positions):
+        keys = self._keys
+        for i in positions:
+            yield keys[i]
+
+    def rank(self, key):
+        return bisect_left(self._keys, key)
 
-    # Recursively traverse: left subtree, current node, right subtree.
-    def _inorder_recursive(self, node, result):
-        if node is not None:
-            self._inorder_recursive(node.left, result)
-            result.append(node.key)
-            self._inorder_recursive(node.right, result)
+    def select(self, k):
+        if not 0 <= k < len(self._keys):
+            raise IndexError("select index out of range")
+        return self._keys[k]
+
+    def count_range(self, lo, hi):
+        if hi < lo:
+            return 0
+        return bisect_right(self._keys, hi) - bisect_left(self._keys, lo)
+
+# --- Drawing constants for BSTApp (in unzoomed canvas pixels) ---
+NODE_RADIUS = 20
+X_SPACING = 50  # Horizontal distance between consecutive keys
+Y_SPACING = 60  # Vertical distance between levels
+TOP_MARGIN = 40
+MIN_SCALE, MAX_SCALE = 0.05, 4.0  # Zoom limits; zooming out goes further if the whole tree needs it
 
 # Uses Tkinter GUI for visualizing and interacting with a BST
+# Nodes are laid out with x = inorder position and y = depth, which never overlaps. Only nodes
+# inside the viewport are drawn, and canvas items are kept per node and moved or recoloured on
+# redraw instead of being recreated. Drag to pan, use the mouse wheel to zoom; "Reset View"
+# zooms out until the whole tree fits on the canvas.
 class BSTApp:
     def __init__(self, root):
         self.bst = BST()
@@ -97,7 +626,7 @@ class BSTApp:
         
         # Create canvas for tree visualization
         self.canvas = tk.Canvas(root, width=800, height=400, bg="white")
-        self.canvas.pack()
+        self.canvas.pack(fill=tk.BOTH, expand=True)
 
         # Create control panel (insert, delete, search, print sorted)
         frame = tk.Frame(root)
@@ -108,11 +637,29 @@ class BSTApp:
         tk.Button(frame, text="Delete", command=self.delete).pack(side=tk.LEFT)
         tk.Button(frame, text="Search", command=self.search).pack(side=tk.LEFT)
         tk.Button(frame, text="Print Sorted", command=self.print_sorted).pack(side=tk.LEFT)
+        tk.Button(frame, text="Reset View", command=self.reset_view).pack(side=tk.LEFT)
 
         # Status display (shows the status of the BST)
         self.status = tk.Label(root, text="", fg="blue")
         self.status.pack()
 
+        # View transform: screen = (layout - view origin) * scale
+        self.view_x = 0.0
+        self.view_y = 0.0
+        self.scale = 1.0
+        self._drag_start = None
+        self._highlight = None
+        self._node_items = {}  # node -> [oval id, text id, last drawn state]
+        self._edge_items = {}  # child node -> [line id, last drawn coords]
+
+        self.canvas.bind("<ButtonPress-1>", self._start_pan)
+        self.canvas.bind("<B1-Motion>", self._pan)
+        self.canvas.bind("<MouseWheel>", self._zoom)  # Windows / macOS
+        self.canvas.bind("<Button-4>", self._zoom)    # Linux scroll up
+        self.canvas.bind("<Button-5>", self._zoom)    # Linux scroll down
+        self.canvas.bind("<Configure>", lambda event: self.redraw(self._highlight))
+        self.reset_view()
+
     # Insert a value from the entry field into the BST
     def insert(self):
         val = self.entry.get()
@@ -122,6 +669,7 @@ class BSTApp:
         val = int(val)
         self.bst.insert(val)
         self.status.config(text=f"Inserted {val}")
+        self._scroll_to(self.bst.search(val))
         self.redraw()
         self.entry.delete(0, tk.END)
 
@@ -147,6 +695,7 @@ class BSTApp:
         found_node = self.bst.search(val)
         if found_node:
             self.status.config(text=f"{val} found in BST.")
+            self._scroll_to(found_node)
         else:
             self.status.config(text=f"{val} not found in BST.")
         self.redraw(highlight_node=found_node)
@@ -157,28 +706,179 @@ class BSTApp:
         sorted_values = self.bst.inorder()
         messagebox.showinfo("BST Inorder (Sorted)", " ".join(map(str, sorted_values)))
 
-    # Redraw the entire tree visualization.
+    # Zoom to fit the whole tree (at most 100%), with the root centred at the top of the canvas.
+    def reset_view(self):
+        self.scale = self._fit_scale()
+        root_x = self.bst._size(self.bst.root.left) * X_SPACING if self.bst.root else 0
+        self.view_x = root_x - self._canvas_width() / 2 / self.scale
+        self.view_y = -TOP_MARGIN / self.scale
+        self.redraw(self._highlight)
+
+    # Largest zoom, up to 100%, at which the whole tree fits on the canvas. The layout is one
+    # column per key, so a tree of a few thousand keys needs far less than MIN_SCALE.
+    def _fit_scale(self):
+        tree_width = len(self.bst) * X_SPACING
+        tree_height = self._tree_depth() * Y_SPACING + 2 * NODE_RADIUS
+        return min(1.0, self._canvas_width() / max(tree_width, 1),
+                   (self._canvas_height() - TOP_MARGIN) / tree_height)
+
+    # Depth of the deepest node (0 for a lone root or an empty tree).
+    def _tree_depth(self):
+        deepest = 0
+        stack = [(self.bst.root, 0)] if self.bst.root is not None else []
+        while stack:
+            node, depth = stack.pop()
+            deepest = max(deepest, depth)
+            for child in (node.left, node.right):
+                if child is not None:
+                    stack.append((child, depth + 1))
+        return deepest
+
+    # Bring the viewport to the updated tree: only nodes on screen are (re)drawn, existing
+    # canvas items are moved/recoloured in place, and items that left the view are deleted.
     def redraw(self, highlight_node=None):
-        self.canvas.delete("all")
-        if self.bst.root:
-            self._draw_tree(self.bst.root, 400, 40, 200, highlight_node)
-
-    # Recursively draw the tree nodes and connections
-    def _draw_tree(self, node, x, y, dx, highlight_node=None):
-        # Draw left subtree (left child)
-        if node.left:
-            self.canvas.create_line(x, y, x - dx, y + 60)
-            self._draw_tree(node.left, x - dx, y + 60, dx // 2, highlight_node)
-        # Draw right subtree (right child)
-        if node.right:
-            self.canvas.create_line(x, y, x + dx, y + 60)
-            self._draw_tree(node.right, x + dx, y + 60, dx // 2, highlight_node)
-        # Draw current node (highlighted if it's the search result)
-        color = "red" if highlight_node is not None and node is highlight_node else "lightblue"
-        self.canvas.create_oval(x - 20, y - 20, x + 20, y + 20, fill=color)
-        self.canvas.create_text(x, y, text=str(node.key), font=("Arial", 12, "bold"))
+        self._highlight = highlight_node
+        width, height = self._canvas_width(), self._canvas_height()
+        tree_width = len(self.bst) * X_SPACING * self.scale
+        if tree_width <= width:
+            # The whole tree fits across the canvas, so keep it centred
+            self.view_x = (len(self.bst) - 1) * X_SPACING / 2 - width / 2 / self.scale
+        # Visible layout rectangle, widened by a node radius so nodes on the border are kept.
+        left = self.view_x - NODE_RADIUS
+        right = self.view_x + width / self.scale + NODE_RADIUS
+        first_col = int(left // X_SPACING)
+        last_col = int(right // X_SPACING) + 1
+        max_depth = int((self.view_y + height / self.scale + NODE_RADIUS) // Y_SPACING) + 1
+
+        drawn_nodes = set()
+        drawn_edges = set()
+        for node, col, depth, parent_col, visible in self._visible_layout(first_col, last_col, max_depth):
+            if parent_col is not None:
+                self._place_edge(node, col, depth, parent_col)
+                drawn_edges.add(node)
+            if visible:
+                self._place_node(node, col, depth)
+                drawn_nodes.add(node)
+
+        # Remove items for nodes that were deleted or scrolled out of view
+        for node in [n for n in self._node_items if n not in drawn_nodes]:
+            oval, text, _ = self._node_items.pop(node)
+            self.canvas.delete(oval, text)
+        for node in [n for n in self._edge_items if n not in drawn_edges]:
+            self.canvas.delete(self._edge_items.pop(node)[0])
+
+    # Yield (node, column, depth, parent column, node visible?) for every node that is inside the
+    # viewport or whose edge to its parent crosses it. Columns come from the subtree sizes, so
+    # subtrees entirely outside [first_col, last_col] are skipped: O(visible + depth) work.
+    def _visible_layout(self, first_col, last_col, max_depth):
+        size = self.bst._size
+        stack = [(self.bst.root, 0, 0, None)]  # (node, first column of its subtree, depth, parent column)
+        while stack:
+            node, start, depth, parent_col = stack.pop()
+            if node is None or depth > max_depth:
+                continue
+            col = start + size(node.left)
+            spans_view = start <= last_col and start + node.size > first_col
+            visible = first_col <= col <= last_col
+            if parent_col is not None and not (min(col, parent_col) <= last_col and max(col, parent_col) >= first_col):
+                parent_col = None  # The edge to the parent is off-screen too
+            if visible or parent_col is not None:
+                yield node, col, depth, parent_col, visible
+            if spans_view:
+                stack.append((node.left, start, depth + 1, col))
+                stack.append((node.right, col + node.count, depth + 1, col))
+
+    def _to_screen(self, col, depth):
+        return (col * X_SPACING - self.view_x) * self.scale, (depth * Y_SPACING - self.view_y) * self.scale
+
+    def _place_node(self, node, col, depth):
+        x, y = self._to_screen(col, depth)
+        r = NODE_RADIUS * self.scale
+        color = "red" if node is self._highlight else "lightblue"
+        font_size = round(12 * self.scale)
+        state = (x, y, r, node.key, color, font_size)
+        items = self._node_items.get(node)
+        if items is None:
+            # Node highlighted if it's the search result
+            oval = self.canvas.create_oval(x - r, y - r, x + r, y + r, fill=color)
+            text = self.canvas.create_text(x, y, text=str(node.key), font=("Arial", max(font_size, 1), "bold"),
+                                           state=tk.NORMAL if font_size >= 5 else tk.HIDDEN)
+            self._node_items[node] = [oval, text, state]
+            return
+        oval, text, old = items
+        if old == state:
+            return
+        if old[:3] != state[:3]:
+            self.canvas.coords(oval, x - r, y - r, x + r, y + r)
+            self.canvas.coords(text, x, y)
+        if old[3] != node.key:
+            self.canvas.itemconfig(text, text=str(node.key))  # Keys move between nodes on delete
+        if old[4] != color:
+            self.canvas.itemconfig(oval, fill=color)
+        if old[5] != font_size:
+            self.canvas.itemconfig(text, font=("Arial", max(font_size, 1), "bold"),
+                                   state=tk.NORMAL if font_size >= 5 else tk.HIDDEN)
+        items[2] = state
+
+    def _place_edge(self, node, col, depth, parent_col):
+        coords = self._to_screen(parent_col, depth - 1) + self._to_screen(col, depth)
+        items = self._edge_items.get(node)
+        if items is None:
+            line = self.canvas.create_line(*coords)
+            self.canvas.tag_lower(line)  # Keep edges underneath the nodes
+            self._edge_items[node] = [line, coords]
+        elif items[1] != coords:
+            self.canvas.coords(items[0], *coords)
+            items[1] = coords
+
+    # Pan so that node is on screen (used after an insert or a successful search).
+    def _scroll_to(self, node):
+        col, depth = 0, 0
+        current = self.bst.root
+        while current is not None and current is not node:
+            if node.key < current.key:
+                current = current.left
+            else:
+                col += self.bst._size(current.left) + current.count
+                current = current.right
+            depth += 1
+        if current is None:
+            return
+        col += self.bst._size(node.left)
+        x, y = self._to_screen(col, depth)
+        if not (0 <= x <= self._canvas_width() and 0 <= y <= self._canvas_height()):
+            self.view_x = col * X_SPACING - self._canvas_width() / 2 / self.scale
+            self.view_y = depth * Y_SPACING - self._canvas_height() / 2 / self.scale
+
+    def _start_pan(self, event):
+        self._drag_start = (event.x, event.y)
+
+    def _pan(self, event):
+        if self._drag_start is None:
+            return
+        dx, dy = event.x - self._drag_start[0], event.y - self._drag_start[1]
+        self._drag_start = (event.x, event.y)
+        self.view_x -= dx / self.scale
+        self.view_y -= dy / self.scale
+        self.redraw(self._highlight)
+
+    def _zoom(self, event):
+        # Zoom around the mouse pointer, keeping the layout point under it fixed.
+        zoom_in = event.num == 4 or getattr(event, "delta", 0) > 0
+        factor = 1.25 if zoom_in else 0.8
+        new_scale = min(MAX_SCALE, max(min(MIN_SCALE, self._fit_scale()), self.scale * factor))
+        self.view_x += event.x / self.scale - event.x / new_scale
+        self.view_y += event.y / self.scale - event.y / new_scale
+        self.scale = new_scale
+        self.redraw(self._highlight)
+
+    def _canvas_width(self):
+        return max(self.canvas.winfo_width(), int(self.canvas["width"]))
+
+    def _canvas_height(self):
+        return max(self.canvas.winfo_height(), int(self.canvas["height"]))
 
 if __name__ == "__main__":
     root = tk.Tk()
     app = BSTApp(root)
-    root.mainloop() 
\ No newline at end of file
+    root.mainloop()
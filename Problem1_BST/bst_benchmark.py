@@ -0,0 +1,335 @@
+# bst_benchmark.py
+#
+# Command-line benchmarks for the BST implementations in bst.py.
+# Usage: python bst_benchmark.py [sizes...]   e.g. python bst_benchmark.py 10000 100000 1000000 10000000
+
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+from bst import BST, Node
+from compact_bst import CompactBST
+from concurrent_bst import ConcurrentBST
+from persistent_bst import PersistentBST
+from sorted_blocks import SortedBlockList
+
+DEFAULT_SIZES = [10**5, 10**6]
+LOOKUPS = 100000  # Random successful searches timed per container
+BLOCK_LOADS = (64, 1000)  # SortedBlockList fan-outs to compare
+VERSIONS = 10000  # Updates applied in the persistence benchmark, each kept as a version
+ZIPF_EXPONENT = 1.1  # Skew of the hot-key access pattern
+ZIPF_ACCESSES = 100000
+READER_COUNTS = (1, 2, 4)  # Reader threads in the concurrency stress test
+STRESS_SECONDS = 1.0
+# The unbalanced tree degrades to O(n^2) on sorted keys, so it is only timed up to this many keys.
+PLAIN_LIMIT = 5000
+
+
+def time_sorted_inserts(tree, n):
+    """
+    Inserts the keys 0..n-1 in ascending order and returns (keys inserted, seconds).
+    """
+    start = time.perf_counter()
+    for key in range(n):
+        tree.insert(key)
+    return n, time.perf_counter() - start
+
+
+def tree_height(tree):
+    # Walks every level breadth-first, so it works for degenerate trees too.
+    height = 0
+    level = [tree.root] if tree.root else []
+    while level:
+        height += 1
+        level = [child for node in level for child in (node.left, node.right) if child]
+    return height
+
+
+def bench_sorted_inserts(sizes):
+    print("\n--- Sorted-insert throughput ---\n")
+    print(f"{'Variant':<10} {'Keys':>10} {'Seconds':>10} {'Keys/s':>12} {'Height':>8}")
+    for n in sizes:
+        for label, balanced, limit in (("plain", None, PLAIN_LIMIT), ("avl", "avl", n)):
+            tree = BST(balanced=balanced)
+            inserted, seconds = time_sorted_inserts(tree, min(n, limit))
+            rate = inserted / seconds if seconds > 0 else float("inf")
+            print(f"{label:<10} {inserted:>10} {seconds:>10.3f} {rate:>12,.0f} {tree_height(tree):>8}")
+
+
+def bench_bulk_load(sizes):
+    print("\n--- Bulk loading (AVL) ---\n")
+    print(f"{'Method':<22} {'Keys':>10} {'Seconds':>10} {'Keys/s':>12} {'Height':>8}")
+    for n in sizes:
+        runs = (
+            ("insert() per key", lambda: _insert_each(n)),
+            ("from_sorted()", lambda: BST.from_sorted(range(n), balanced="avl")),
+            ("bulk_insert() merge", lambda: _bulk_merge(n)),
+        )
+        for label, build in runs:
+            start = time.perf_counter()
+            tree = build()
+            seconds = time.perf_counter() - start
+            rate = n / seconds if seconds > 0 else float("inf")
+            print(f"{label:<22} {n:>10} {seconds:>10.3f} {rate:>12,.0f} {tree_height(tree):>8}")
+
+
+def _insert_each(n):
+    tree = BST(balanced="avl")
+    for key in range(n):
+        tree.insert(key)
+    return tree
+
+
+def _bulk_merge(n):
+    # Loads the even keys, then merges the odd keys in as one batch.
+    tree = BST.from_sorted(range(0, n, 2), balanced="avl")
+    tree.bulk_insert(range(1, n, 2))
+    return tree
+
+
+class DictNode:
+    # The previous node layout: the same fields, stored in a per-instance __dict__.
+    def __init__(self, key):
+        self.left = None
+        self.right = None
+        self.key = key
+        self.height = 1
+        self.size = 1
+
+
+def _link_balanced(node_class, keys):
+    # Build a balanced tree of node_class objects without going through BST.
+    nodes = [node_class(key) for key in keys]
+    for i, node in enumerate(nodes):
+        left, right = 2 * i + 1, 2 * i + 2
+        node.left = nodes[left] if left < len(nodes) else None
+        node.right = nodes[right] if right < len(nodes) else None
+    return nodes[0] if nodes else None
+
+
+def measure_bytes(build):
+    # Return (peak bytes allocated while build() runs, result), keeping the result alive.
+    tracemalloc.start()
+    result = build()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak, result
+
+
+def bench_memory(sizes):
+    print("\n--- Memory per key ---\n")
+    print(f"{'Representation':<22} {'Keys':>10} {'MB':>10} {'Bytes/key':>10}")
+    for n in sizes:
+        # Keys well above 256 so CPython's small-int cache does not hide the key cost.
+        keys = range(10**9, 10**9 + n)
+        runs = (
+            ("dict nodes (before)", lambda: _link_balanced(DictNode, keys)),
+            ("__slots__ nodes", lambda: _link_balanced(Node, keys)),
+            ("BST.from_sorted()", lambda: BST.from_sorted(keys, balanced="avl")),
+            ("CompactBST (arrays)", lambda: CompactBST.from_sorted(keys)),
+        )
+        for label, build in runs:
+            peak, result = measure_bytes(build)
+            print(f"{label:<22} {n:>10} {peak / 2**20:>10.1f} {peak / n:>10.1f}")
+            del result
+
+
+def bench_containers(sizes):
+    print("\n--- Sorted containers: lookup latency and memory ---\n")
+    print(f"{'Container':<26} {'Keys':>10} {'ns/lookup':>10} {'MB':>10} {'Bytes/key':>10}")
+    for n in sizes:
+        keys = range(10**9, 10**9 + n)
+        probes = [random.choice(keys) for _ in range(LOOKUPS)]
+        runs = [
+            ("BST (avl)", lambda: BST.from_sorted(keys, balanced="avl")),
+            ("CompactBST", lambda: CompactBST.from_sorted(keys)),
+        ]
+        for load in BLOCK_LOADS:
+            runs.append((f"SortedBlockList(load={load})", lambda load=load: SortedBlockList.from_sorted(keys, load)))
+        for label, build in runs:
+            peak, container = measure_bytes(build)
+            search = container.search
+            start = time.perf_counter()
+            for key in probes:
+                search(key)
+            ns = (time.perf_counter() - start) / len(probes) * 1e9
+            print(f"{label:<26} {n:>10} {ns:>10.0f} {peak / 2**20:>10.1f} {peak / n:>10.1f}")
+            del container
+
+
+def bench_snapshot(sizes):
+    print("\n--- Snapshot save / cold start ---\n")
+    print(f"{'Step':<26} {'Keys':>10} {'Seconds':>10}")
+    for n in sizes:
+        tree = BST.from_sorted(range(n), balanced="avl")
+        probes = [random.randrange(n) for _ in range(LOOKUPS)]
+        fd, path = tempfile.mkstemp(suffix=".bst")
+        os.close(fd)
+        try:
+            steps = (
+                ("save()", lambda: tree.save(path)),
+                ("replay insert() per key", lambda: _insert_each(n)),
+                ("load() (balanced rebuild)", lambda: BST.load(path)),
+                ("load(use_mmap=True)", lambda: BST.load(path, use_mmap=True)),
+            )
+            for label, step in steps:
+                result = None  # Free the previous tree first so its teardown is not timed
+                start = time.perf_counter()
+                result = step()
+                print(f"{label:<26} {n:>10} {time.perf_counter() - start:>10.3f}")
+            with result as mapped:
+                start = time.perf_counter()
+                for key in probes:
+                    mapped.search(key)
+                print(f"{f'{LOOKUPS} mmap searches':<26} {n:>10} {time.perf_counter() - start:>10.3f}")
+        finally:
+            os.remove(path)
+
+
+def bench_persistent(sizes):
+    print("\n--- Persistent versions ---\n")
+    print(f"{'Keys':>10} {'Versions':>10} {'us/update':>10} {'Bytes/version':>14}")
+    for n in sizes:
+        base = PersistentBST.from_sorted(range(0, 2 * n, 2))
+        updates = [random.randrange(2 * n) for _ in range(VERSIONS)]
+
+        def apply_all():
+            versions = [base]
+            for key in updates:
+                versions.append(versions[-1].insert(key))
+            return versions
+
+        start = time.perf_counter()
+        apply_all()
+        seconds = time.perf_counter() - start
+        peak, versions = measure_bytes(apply_all)
+        print(f"{n:>10} {VERSIONS:>10} {seconds / VERSIONS * 1e6:>10.1f} {peak / VERSIONS:>14,.0f}")
+        del versions
+
+
+def zipf_accesses(keys, count, exponent, seed=0):
+    # Draw count keys where the i-th most popular key is chosen with probability ~ 1 / i**exponent.
+    rng = random.Random(seed)
+    popularity = list(keys)
+    rng.shuffle(popularity)  # Hot keys are scattered across the key space
+    weights = [1 / rank ** exponent for rank in range(1, len(popularity) + 1)]
+    return rng.choices(popularity, weights=weights, k=count)
+
+
+def access_depth(tree, key):
+    # Number of nodes a search for key visits.
+    depth = 0
+    node = tree.root
+    while node is not None:
+        depth += 1
+        if key == node.key:
+            break
+        node = node.left if key < node.key else node.right
+    return depth
+
+
+def bench_zipf_search(sizes):
+    print(f"\n--- Zipf-distributed searches (s={ZIPF_EXPONENT}) ---\n")
+    print(f"{'Variant':<10} {'Keys':>10} {'Avg path':>10} {'Searches/s':>12}")
+    for n in sizes:
+        keys = list(range(n))
+        random.Random(1).shuffle(keys)  # Random insertion order, so the plain tree is not a list
+        accesses = zipf_accesses(range(n), ZIPF_ACCESSES, ZIPF_EXPONENT)
+        for balanced in (None, "avl", "splay"):
+            tree = BST(balanced=balanced)
+            for key in keys:
+                tree.insert(key)
+            # Measure path lengths on a first pass, then time a second pass over the warmed-up tree
+            total_depth = 0
+            for key in accesses:
+                total_depth += access_depth(tree, key)
+                tree.search(key)
+            start = time.perf_counter()
+            for key in accesses:
+                tree.search(key)
+            rate = len(accesses) / (time.perf_counter() - start)
+            print(f"{str(balanced):<10} {n:>10} {total_depth / len(accesses):>10.2f} {rate:>12,.0f}")
+
+
+def _locked(lock, operation):
+    def run(key):
+        with lock:
+            return operation(key)
+    return run
+
+
+def run_stress(search, insert, delete, n, readers, seconds):
+    """
+    Runs `readers` threads doing random searches over keys 0..n-1 while one writer thread
+    inserts and deletes keys outside that range. Returns (reads/s, writes/s).
+    """
+    stop = threading.Event()
+    reads = [0] * readers
+    writes = [0]
+
+    def reader(i):
+        rng = random.Random(i)
+        done = 0
+        while not stop.is_set():
+            search(rng.randrange(n))
+            done += 1
+        reads[i] = done
+
+    def writer():
+        rng = random.Random(-1)
+        done = 0
+        while not stop.is_set():
+            key = n + rng.randrange(n)
+            insert(key)
+            delete(key)
+            done += 2
+        writes[0] = done
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    threads.append(threading.Thread(target=writer))
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return sum(reads) / seconds, writes[0] / seconds
+
+
+def bench_concurrent(sizes):
+    print("\n--- Concurrent reads under a writer ---\n")
+    print(f"{'Variant':<26} {'Keys':>10} {'Readers':>8} {'Reads/s':>12} {'Writes/s':>12}")
+    for n in sizes:
+        locked_tree = BST.from_sorted(range(n), balanced="avl")
+        lock = threading.Lock()
+        cow_tree = ConcurrentBST()
+        cow_tree.bulk_insert(range(n))
+        variants = (
+            ("BST + one lock", _locked(lock, locked_tree.search), _locked(lock, locked_tree.insert),
+             _locked(lock, locked_tree.delete)),
+            ("ConcurrentBST (COW)", cow_tree.search, cow_tree.insert, cow_tree.delete),
+        )
+        for label, search, insert, delete in variants:
+            for readers in READER_COUNTS:
+                read_rate, write_rate = run_stress(search, insert, delete, n, readers, STRESS_SECONDS)
+                print(f"{label:<26} {n:>10} {readers:>8} {read_rate:>12,.0f} {write_rate:>12,.0f}")
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    bench_sorted_inserts(sizes)
+    bench_bulk_load(sizes)
+    bench_memory(sizes)
+    bench_containers(sizes)
+    bench_snapshot(sizes)
+    bench_persistent(sizes)
+    bench_zipf_search(sizes)
+    bench_concurrent(sizes)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import threading
+
+from persistent_bst import PersistentBST
+
+# A thread-safe, AVL-balanced BST for many readers and a few writers.
+# Writers take a lock and publish each update as a new PersistentBST version built by path
+# copying; the nodes of a published version are never modified. Readers take no lock at all:
+# each read grabs the current version once and works on that consistent snapshot, so it can
+# never see a half-applied update such as the successor swap in BST._delete.
+class ConcurrentBST:
+    def __init__(self, multiset=False):
+        self.multiset = multiset
+        self._current = PersistentBST(multiset)
+        self._write_lock = threading.Lock()
+
+    # Return the current version. It is immutable, so later updates never affect it.
+    def snapshot(self):
+        return self._current  # A single attribute read, so always a complete version
+
+    # --- Writers (serialized by the write lock) ---
+
+    def insert(self, key):
+        with self._write_lock:
+            self._current = self._current.insert(key)
+
+    def bulk_insert(self, keys):
+        with self._write_lock:
+            self._current = self._current.bulk_insert(keys)  # Readers see none or all of the batch
+
+    def delete(self, key):
+        with self._write_lock:
+            version = self._current.delete(key)
+            deleted = version is not self._current
+            self._current = version
+        return deleted
+
+    # --- Readers (lock-free, each on one snapshot) ---
+
+    def __len__(self):
+        return len(self._current)
+
+    def search(self, key):
+        return self._current.search(key)
+
+    def inorder(self):
+        return self._current.inorder()
+
+    def iter_inorder(self):
+        return self._current.iter_inorder()
+
+    def range(self, lo=None, hi=None, reverse=False, limit=None):
+        return self._current.range(lo, hi, reverse, limit)
+
+    def rank(self, key):
+        return self._current.rank(key)
+
+    def select(self, k):
+        return self._current.select(k)
+
+    def count_range(self, lo, hi):
+        return self._current.count_range(lo, hi)
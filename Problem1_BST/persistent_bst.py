@@ -0,0 +1,165 @@
+from heapq import merge
+
+from bst import BST, Node
+
+# --- Path-copying AVL operations ---
+# These never modify an existing node: every node on the path from the root to the change
+# is copied, and the untouched subtrees are shared with the previous version of the tree.
+
+def _height(node):
+    return node.height if node is not None else 0
+
+def _size(node):
+    return node.size if node is not None else 0
+
+def _make(key, count, left, right):
+    # Create a new node over the given children, with its height and size filled in.
+    node = Node(key, count)
+    node.left = left
+    node.right = right
+    node.height = 1 + max(_height(left), _height(right))
+    node.size = count + _size(left) + _size(right)
+    return node
+
+def _balance(key, count, left, right):
+    # Like _make, but applies the AVL rotations (on fresh copies) if the children's heights differ by 2.
+    if _height(left) > _height(right) + 1:
+        if _height(left.left) >= _height(left.right):
+            return _make(left.key, left.count, left.left, _make(key, count, left.right, right))
+        pivot = left.right  # Left-right case
+        return _make(pivot.key, pivot.count,
+                     _make(left.key, left.count, left.left, pivot.left),
+                     _make(key, count, pivot.right, right))
+    if _height(right) > _height(left) + 1:
+        if _height(right.right) >= _height(right.left):
+            return _make(right.key, right.count, _make(key, count, left, right.left), right.right)
+        pivot = right.left  # Right-left case
+        return _make(pivot.key, pivot.count,
+                     _make(key, count, left, pivot.left),
+                     _make(right.key, right.count, pivot.right, right.right))
+    return _make(key, count, left, right)
+
+def _rebuild_path(path, child):
+    # Copy the (node, went_left) ancestors bottom-up around a replacement child; returns the new root.
+    for node, went_left in reversed(path):
+        if went_left:
+            child = _balance(node.key, node.count, child, node.right)
+        else:
+            child = _balance(node.key, node.count, node.left, child)
+    return child
+
+def _insert(root, key, multiset):
+    # Return the root of a new version with key added. Duplicates go to the right.
+    path = []
+    node = root
+    while node is not None:
+        if multiset and key == node.key:
+            return _rebuild_path(path, _make(node.key, node.count + 1, node.left, node.right))
+        went_left = key < node.key
+        path.append((node, went_left))
+        node = node.left if went_left else node.right
+    return _rebuild_path(path, Node(key))
+
+def _delete(root, key):
+    # Return (root of a new version without one copy of key, whether anything was removed).
+    path = []
+    node = root
+    while node is not None and key != node.key:
+        went_left = key < node.key
+        path.append((node, went_left))
+        node = node.left if went_left else node.right
+    if node is None:
+        return root, False
+    if node.count > 1:
+        replacement = _make(node.key, node.count - 1, node.left, node.right)
+    elif node.left is None:
+        replacement = node.right
+    elif node.right is None:
+        replacement = node.left
+    else:
+        # Two children - detach the inorder successor and put a copy of it in the node's place
+        right, succ = _pop_min(node.right)
+        replacement = _balance(succ.key, succ.count, node.left, right)
+    return _rebuild_path(path, replacement), True
+
+def _pop_min(node):
+    # Return (new subtree without its leftmost node, that leftmost node).
+    path = []
+    while node.left is not None:
+        path.append((node, True))
+        node = node.left
+    return _rebuild_path(path, node.right), node
+
+
+# An immutable, AVL-balanced BST version for keeping history (time-travel queries).
+# insert/delete/bulk_insert never change this version: they return a new PersistentBST
+# that shares every untouched subtree with this one, at a cost of O(log n) new nodes
+# per key (a large bulk_insert builds a whole new tree instead). Any number of old
+# versions stay fully queryable.
+class PersistentBST:
+    def __init__(self, multiset=False):
+        self.multiset = multiset
+        self._tree = BST(balanced="avl", multiset=multiset)  # Read-only view used for queries
+
+    @property
+    def root(self):
+        return self._tree.root
+
+    def _version(self, root):
+        version = PersistentBST(self.multiset)
+        version._tree.root = root
+        return version
+
+    # Build a first version from keys that are already in ascending order, in O(n).
+    @classmethod
+    def from_sorted(cls, iterable, multiset=False):
+        version = cls(multiset)
+        version._tree = BST.from_sorted(iterable, balanced="avl", multiset=multiset)
+        return version
+
+    # --- Updates: each returns a new version ---
+
+    def insert(self, key):
+        return self._version(_insert(self.root, key, self.multiset))
+
+    # Large batches are merged with this version's keys and built into a fresh tree in O(n + m)
+    # (sharing nothing); small ones are path-copied in one key at a time.
+    def bulk_insert(self, keys):
+        batch = sorted(keys)
+        if len(batch) * 8 < len(self):
+            root = self.root
+            for key in batch:
+                root = _insert(root, key, self.multiset)
+            return self._version(root)
+        return PersistentBST.from_sorted(merge(self.iter_inorder(), batch), self.multiset)
+
+    # Return a version without one copy of key (this same version if key is absent).
+    def delete(self, key):
+        root, deleted = _delete(self.root, key)
+        return self._version(root) if deleted else self
+
+    # --- Queries ---
+
+    def __len__(self):
+        return len(self._tree)
+
+    def search(self, key):
+        return self._tree.search(key)
+
+    def inorder(self):
+        return self._tree.inorder()
+
+    def iter_inorder(self):
+        return self._tree.iter_inorder()
+
+    def range(self, lo=None, hi=None, reverse=False, limit=None):
+        return self._tree.range(lo, hi, reverse, limit)
+
+    def rank(self, key):
+        return self._tree.rank(key)
+
+    def select(self, k):
+        return self._tree.select(k)
+
+    def count_range(self, lo, hi):
+        return self._tree.count_range(lo, hi)
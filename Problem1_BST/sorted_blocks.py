@@ -0,0 +1,142 @@
+from bisect import bisect_left, bisect_right, insort_right
+from itertools import islice
+
+DEFAULT_LOAD = 1000  # Target number of keys per block (the container's fan-out)
+
+# A sorted container with the same insert/delete/search/inorder/range operations as BST,
+# laid out as a list of sorted blocks (a flat, two-level B-tree) instead of one node per key.
+# Lookups bisect the list of block maxima and then a single block, so they touch two
+# contiguous arrays instead of chasing O(log n) node pointers.
+class SortedBlockList:
+    def __init__(self, load=DEFAULT_LOAD):
+        if load < 2:
+            raise ValueError("load must be at least 2")
+        self.load = load
+        self._blocks = []  # Non-empty sorted lists of keys, each at most 2 * load long
+        self._maxes = []   # _maxes[i] == _blocks[i][-1], for choosing a block by bisection
+        self._len = 0
+
+    # Build the container from keys that are already in ascending order, in O(n).
+    @classmethod
+    def from_sorted(cls, iterable, load=DEFAULT_LOAD):
+        container = cls(load)
+        keys = iter(iterable)
+        block = list(islice(keys, load))
+        while block:
+            if container._blocks and block[0] < container._maxes[-1]:
+                raise ValueError("from_sorted() requires keys in ascending order")
+            if any(a > b for a, b in zip(block, islice(block, 1, None))):
+                raise ValueError("from_sorted() requires keys in ascending order")
+            container._blocks.append(block)
+            container._maxes.append(block[-1])
+            container._len += len(block)
+            block = list(islice(keys, load))
+        return container
+
+    def __len__(self):
+        return self._len
+
+    def __contains__(self, key):
+        return self.search(key)
+
+    # Insert a key. Duplicates go after existing equal keys.
+    def insert(self, key):
+        if not self._blocks:
+            self._blocks.append([key])
+            self._maxes.append(key)
+            self._len = 1
+            return
+        i = bisect_right(self._maxes, key)
+        if i == len(self._blocks):
+            i -= 1  # Larger than everything: append to the last block
+        block = self._blocks[i]
+        insort_right(block, key)
+        self._maxes[i] = block[-1]
+        self._len += 1
+        if len(block) > 2 * self.load:
+            # Split an overfull block in half
+            half = block[self.load:]
+            del block[self.load:]
+            self._blocks.insert(i + 1, half)
+            self._maxes[i] = block[-1]
+            self._maxes.insert(i + 1, half[-1])
+
+    # Delete one occurrence of key; returns True if a key was removed.
+    def delete(self, key):
+        i = bisect_left(self._maxes, key)
+        if i == len(self._blocks):
+            return False
+        block = self._blocks[i]
+        j = bisect_left(block, key)
+        if block[j] != key:
+            return False
+        del block[j]
+        self._len -= 1
+        if not block:
+            del self._blocks[i]
+            del self._maxes[i]
+            return True
+        self._maxes[i] = block[-1]
+        if len(block) < self.load // 2 and len(self._blocks) > 1:
+            # Merge an underfull block into a neighbour, splitting again if that overfills it
+            if i == len(self._blocks) - 1:
+                i -= 1
+            merged = self._blocks[i] + self._blocks[i + 1]
+            del self._blocks[i + 1]
+            del self._maxes[i + 1]
+            if len(merged) > 2 * self.load:
+                half = len(merged) // 2
+                self._blocks[i:i + 1] = [merged[:half], merged[half:]]
+                self._maxes[i:i + 1] = [merged[half - 1], merged[-1]]
+            else:
+                self._blocks[i] = merged
+                self._maxes[i] = merged[-1]
+        return True
+
+    # Return True if key is present.
+    def search(self, key):
+        i = bisect_left(self._maxes, key)
+        if i == len(self._blocks):
+            return False
+        block = self._blocks[i]
+        return block[bisect_left(block, key)] == key
+
+    # Return a list of keys in sorted order.
+    def inorder(self):
+        return [key for block in self._blocks for key in block]
+
+    # Lazily yield keys in sorted order.
+    def iter_inorder(self):
+        for block in self._blocks:
+            yield from block
+
+    # Lazily yield the keys in the closed range [lo, hi] (None means unbounded), ascending or
+    # descending with reverse=True, stopping after limit keys.
+    def range(self, lo=None, hi=None, reverse=False, limit=None):
+        if not self._blocks or (limit is not None and limit <= 0):
+            return
+        # Locate both ends as (block, position) pairs; the range is start <= item < stop.
+        start_block = 0 if lo is None else bisect_left(self._maxes, lo)
+        if start_block == len(self._blocks):
+            return
+        start_pos = 0 if lo is None else bisect_left(self._blocks[start_block], lo)
+        stop_block = len(self._blocks) - 1 if hi is None else min(bisect_right(self._maxes, hi), len(self._blocks) - 1)
+        stop_pos = len(self._blocks[stop_block]) if hi is None else bisect_right(self._blocks[stop_block], hi)
+        yielded = 0
+        blocks = range(start_block, stop_block + 1)
+        for b in reversed(blocks) if reverse else blocks:
+            block = self._blocks[b]
+            first = start_pos if b == start_block else 0
+            last = stop_pos if b == stop_block else len(block)
+            if first >= last:
+                continue
+            if limit is not None:
+                if reverse:
+                    first = max(first, last - (limit - yielded))
+                else:
+                    last = min(last, first + (limit - yielded))
+            piece = block[first:last]
+            yield from reversed(piece) if reverse else piece
+            yielded += last - first
+            if limit is not None and yielded >= limit:
+                return
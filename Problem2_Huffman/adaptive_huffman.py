@@ -0,0 +1,218 @@
+# adaptive_huffman.py
+#
+# Single-pass adaptive Huffman coding (the FGK algorithm). Unlike huffman_encoding in
+# huffman_encoder.py, no frequency pass is needed: encoder and decoder start from the same
+# empty tree and update it identically after every symbol, so text can be compressed as it
+# arrives (log streams, sockets) and decoded from any prefix of the output.
+#
+# Stream format: each symbol is its current code. A symbol seen for the first time is sent as
+# the code of the NYT ("not yet transmitted") leaf followed by its 21-bit code point. The
+# stream ends with NYT + END_OF_STREAM, then zero padding to a whole byte.
+
+SYMBOL_BITS = 21  # Enough for every Unicode code point (up to 0x10FFFF)
+END_OF_STREAM = (1 << SYMBOL_BITS) - 1  # 0x1FFFFF, which is not a valid code point
+FLUSH_BITS = 4096  # Encoder output is flushed to bytes whenever this many bits are pending
+
+
+class AdaptiveNode:
+    __slots__ = ("weight", "symbol", "parent", "left", "right", "index")
+
+    def __init__(self, symbol=None, parent=None, index=0):
+        self.weight = 0
+        self.symbol = symbol  # None for internal nodes and the NYT leaf
+        self.parent = parent
+        self.left = None
+        self.right = None
+        self.index = index  # Position in AdaptiveHuffmanTree.nodes
+
+
+class AdaptiveHuffmanTree:
+    """
+    The tree shared (as identical copies) by encoder and decoder.
+    `nodes` lists every node with weights non-increasing and every parent before its
+    children (the sibling property); the root is nodes[0] and the NYT leaf is always last.
+    """
+    def __init__(self):
+        self.root = AdaptiveNode()
+        self.nyt = self.root
+        self.nodes = [self.root]
+        self.leaves = {}  # {symbol : leaf}
+
+    def code(self, node):
+        # Returns (code, length) of the path from the root to node, as an integer.
+        code = length = 0
+        while node.parent is not None:
+            if node.parent.right is node:
+                code |= 1 << length
+            length += 1
+            node = node.parent
+        return code, length
+
+    def add(self, symbol):
+        # Splits the NYT leaf into a new NYT (left) and a leaf for symbol (right), then counts it.
+        old = self.nyt
+        leaf = AdaptiveNode(symbol, old, len(self.nodes))
+        self.nyt = AdaptiveNode(None, old, len(self.nodes) + 1)
+        old.left, old.right = self.nyt, leaf
+        self.nodes += (leaf, self.nyt)
+        self.leaves[symbol] = leaf
+        self.increment(leaf)
+
+    def increment(self, node):
+        """
+        Adds one occurrence at node and restores the sibling property on the way to the root:
+        before each increment the node is swapped with the first node of equal weight in
+        `nodes` (its block leader), unless that is its own parent.
+        """
+        nodes = self.nodes
+        while node is not None:
+            leader = node.index
+            while leader > 0 and nodes[leader - 1].weight == node.weight:
+                leader -= 1
+            if leader != node.index and nodes[leader] is not node.parent:
+                self._swap(node, nodes[leader])
+            node.weight += 1
+            node = node.parent
+
+    def _swap(self, a, b):
+        # Exchanges two subtrees (never ancestor and descendant) and their positions in `nodes`.
+        self.nodes[a.index], self.nodes[b.index] = b, a
+        a.index, b.index = b.index, a.index
+        parent_a, parent_b = a.parent, b.parent
+        if parent_a is parent_b:
+            parent_a.left, parent_a.right = parent_a.right, parent_a.left
+            return
+        if parent_a.left is a:
+            parent_a.left = b
+        else:
+            parent_a.right = b
+        if parent_b.left is b:
+            parent_b.left = a
+        else:
+            parent_b.right = a
+        a.parent, b.parent = parent_b, parent_a
+
+
+class AdaptiveHuffmanEncoder:
+    """
+    Incremental encoder: encode() returns the bytes completed so far, finish() ends the stream.
+    """
+    def __init__(self):
+        self.tree = AdaptiveHuffmanTree()
+        self.bit_length = 0  # Bits emitted so far, excluding the final padding
+        self._acc = 0  # Pending bits not yet returned as bytes
+        self._nbits = 0
+
+    def encode(self, text):
+        tree = self.tree
+        out = bytearray()
+        for char in text:
+            leaf = tree.leaves.get(char)
+            if leaf is not None:
+                code, length = tree.code(leaf)
+                self._push(code, length)
+                tree.increment(leaf)
+            else:
+                self._push_escape(ord(char))
+                tree.add(char)
+            if self._nbits >= FLUSH_BITS:
+                self._flush(out)
+        self._flush(out)
+        return bytes(out)
+
+    def finish(self):
+        # Writes the end-of-stream marker and pads the last byte with zeros.
+        out = bytearray()
+        self._push_escape(END_OF_STREAM)
+        self._flush(out)
+        if self._nbits:
+            out.append(self._acc << (8 - self._nbits))
+            self._acc = self._nbits = 0
+        return bytes(out)
+
+    def _push(self, code, length):
+        self._acc = (self._acc << length) | code
+        self._nbits += length
+        self.bit_length += length
+
+    def _push_escape(self, point):
+        code, length = self.tree.code(self.tree.nyt)
+        self._push((code << SYMBOL_BITS) | point, length + SYMBOL_BITS)
+
+    def _flush(self, out):
+        # Moves every whole byte of pending bits into out.
+        spare = self._nbits % 8
+        whole = self._nbits - spare
+        if whole:
+            out += (self._acc >> spare).to_bytes(whole // 8, "big")
+            self._acc &= (1 << spare) - 1
+            self._nbits = spare
+
+
+class AdaptiveHuffmanDecoder:
+    """
+    Incremental decoder: decode() accepts the stream in pieces of any size and returns the
+    text completed so far. `finished` becomes True once the end-of-stream marker is read.
+    """
+    def __init__(self):
+        self.tree = AdaptiveHuffmanTree()
+        self.finished = False
+        self._node = self.tree.root  # Where the current code's walk has got to
+        self._acc = 0  # Bits received but not yet consumed
+        self._nbits = 0
+
+    def decode(self, data):
+        tree = self.tree
+        decoded_chars = []
+        for byte in data:
+            if self.finished:
+                break
+            self._acc = (self._acc << 8) | byte
+            self._nbits += 8
+            node = self._node
+            while True:
+                if node is tree.nyt:
+                    # Escape: the next SYMBOL_BITS bits are a new symbol's code point
+                    if self._nbits < SYMBOL_BITS:
+                        break
+                    self._nbits -= SYMBOL_BITS
+                    point = self._acc >> self._nbits
+                    self._acc &= (1 << self._nbits) - 1
+                    if point == END_OF_STREAM:
+                        self.finished = True
+                        break
+                    char = chr(point)
+                    decoded_chars.append(char)
+                    tree.add(char)
+                    node = tree.root
+                elif node.symbol is not None:
+                    decoded_chars.append(node.symbol)
+                    tree.increment(node)
+                    node = tree.root
+                elif self._nbits == 0:
+                    break
+                else:
+                    self._nbits -= 1
+                    node = node.right if (self._acc >> self._nbits) & 1 else node.left
+                    self._acc &= (1 << self._nbits) - 1
+            self._node = node
+        return "".join(decoded_chars)
+
+
+def adaptive_compress(text):
+    """
+    Encodes text in one call; returns the complete stream as bytes.
+    """
+    encoder = AdaptiveHuffmanEncoder()
+    return encoder.encode(text) + encoder.finish()
+
+
+def adaptive_decompress(data):
+    """
+    Decodes a complete stream produced by adaptive_compress or AdaptiveHuffmanEncoder.
+    """
+    decoder = AdaptiveHuffmanDecoder()
+    text = decoder.decode(data)
+    if not decoder.finished:
+        raise ValueError("truncated adaptive Huffman stream")
+    return text
@@ -0,0 +1,360 @@
+# huffman_benchmark.py
+#
+# Command-line benchmarks for the Huffman coding toolkit in huffman_encoder.py.
+# Usage: python huffman_benchmark.py
+#        python huffman_benchmark.py suite [sizes...] [--json PATH]   e.g. suite 1K 1M 64M 1G --json results.json
+
+import itertools
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+from adaptive_huffman import adaptive_compress, adaptive_decompress
+from huffman_blocks import HuffmanArchive, compress_blocks, decompress_blocks
+from huffman_encoder import (FILE_CHUNK_BYTES, byte_frequencies, compress, decode_packed, decompress,
+                             encode_documents, encode_packed, huffman_codes_from_frequencies, huffman_decoding,
+                             huffman_encoding, iter_decode_packed, iter_encode_packed, peak_rss_mb, write_header)
+
+# --- Parallel encoding benchmark settings ---
+DOCUMENTS = 64  # Independent documents encoded per run
+DOCUMENT_CHARS = 50_000  # Characters per document
+WORKER_COUNTS = sorted({1, 2, 4, os.cpu_count() or 1})
+
+# --- Decoder benchmark settings ---
+DECODE_CHARS = 1_000_000  # Characters in the decoded text
+
+# --- Adaptive vs static benchmark settings ---
+ADAPTIVE_CHARS = 200_000  # Characters in the compared text
+
+# --- Block-parallel benchmark settings ---
+BLOCK_FILE_DOCUMENTS = 16  # 1 MB documents concatenated into the compressed file
+RANDOM_READS = 200  # Random reads timed against the seekable archive
+RANDOM_READ_BYTES = 100  # Bytes per random read
+
+# --- Throughput suite settings ---
+SUITE_CORPORA = ("uniform", "zipf", "english", "binary")
+DEFAULT_SUITE_SIZES = ["1K", "64K", "1M", "16M"]
+SUITE_MIN_BYTES = 1 << 20  # Small inputs are processed repeatedly until at least this much is timed
+SUITE_JSON = "huffman_benchmark.json"
+ENGLISH_WORDS = (
+    "the of and to a in is it you that he was for on are with as I his they be at one have this from "
+    "or had by hot word but what some we can out other were all there when up use your how said an "
+    "each she which do their time if will way about many then them write would like so these her long "
+    "make thing see him two has look more day could go come did number sound no most people my over "
+    "know water than call first who may down side been now find any new work part take get place made "
+    "live where after back little only round man year came show every good me give our under name very"
+).split()
+
+
+def make_documents(count, length, seed=0):
+    """
+    Builds `count` random documents of lowercase words with a skewed letter distribution.
+    """
+    rng = random.Random(seed)
+    alphabet = "etaoinshrdlcumwfgypbvkjxqz "
+    weights = [1 / rank for rank in range(1, len(alphabet) + 1)]
+    return ["".join(rng.choices(alphabet, weights=weights, k=length)) for _ in range(count)]
+
+
+def bench_parallel_encoding(documents):
+    """
+    Encodes the same batch of documents across thread and process pools of different sizes.
+    """
+    total_mb = sum(len(doc) for doc in documents) / 2**20
+    print("\n--- Parallel document encoding ---\n")
+    print(f"{len(documents)} documents, {total_mb:.1f} MB total\n")
+    print(f"{'Pool':<10} {'Workers':>8} {'Seconds':>10} {'MB/s':>10} {'Docs/s':>10}")
+    for pool, use_processes in (("threads", False), ("processes", True)):
+        for workers in WORKER_COUNTS:
+            start = time.perf_counter()
+            encode_documents(documents, workers=workers, use_processes=use_processes)
+            seconds = time.perf_counter() - start
+            print(f"{pool:<10} {workers:>8} {seconds:>10.3f} {total_mb / seconds:>10.2f} "
+                  f"{len(documents) / seconds:>10.1f}")
+
+
+def bench_decoding(text):
+    """
+    Compares the bit-string decoder (huffman_decoding) with the table-driven packed decoder.
+    """
+    _, codes = huffman_encoding(text)
+    encoded_string = "".join(codes[char] for char in text)
+    encoded, bit_length = encode_packed(text, codes)
+    text_mb = len(text) / 2**20
+    print("\n--- Decoding ---\n")
+    print(f"{text_mb:.1f} MB of text, {bit_length / len(text):.2f} bits/char, "
+          f"longest code {max(map(len, codes.values()))} bits\n")
+    print(f"{'Decoder':<22} {'Seconds':>10} {'MB/s':>10}")
+    for name, decode in (("huffman_decoding", lambda: huffman_decoding(encoded_string, codes)),
+                         ("decode_packed", lambda: decode_packed(encoded, bit_length, codes))):
+        start = time.perf_counter()
+        decoded = decode()
+        seconds = time.perf_counter() - start
+        assert decoded == text
+        print(f"{name:<22} {seconds:>10.3f} {text_mb / seconds:>10.2f}")
+
+
+def bench_adaptive(text):
+    """
+    Compares single-pass adaptive Huffman coding with the two-pass static coder
+    (compress/decompress) on compression ratio and throughput.
+    """
+    text_mb = len(text) / 2**20
+    print("\n--- Adaptive vs static Huffman ---\n")
+    print(f"{text_mb:.2f} MB of text\n")
+    print(f"{'Coder':<10} {'Bytes':>10} {'Ratio':>8} {'Enc MB/s':>10} {'Dec MB/s':>10}")
+    for name, encode, decode in (("static", compress, decompress),
+                                 ("adaptive", adaptive_compress, adaptive_decompress)):
+        start = time.perf_counter()
+        data = encode(text)
+        encode_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        decoded = decode(data)
+        decode_seconds = time.perf_counter() - start
+        assert decoded == text
+        print(f"{name:<10} {len(data):>10} {len(data) / len(text.encode('utf-8')):>8.3f} "
+              f"{text_mb / encode_seconds:>10.2f} {text_mb / decode_seconds:>10.2f}")
+
+
+def bench_block_parallel(documents):
+    """
+    Compresses and decompresses one file with huffman_blocks on process pools of different
+    sizes; speedup is relative to a single worker.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        src, packed, out = (os.path.join(tmp, name) for name in ("input.txt", "input.hufb", "output.txt"))
+        with open(src, "w", encoding="latin-1") as f:
+            f.writelines(documents)
+        size_mb = os.path.getsize(src) / 2**20
+        print("\n--- Block-parallel file compression ---\n")
+        print(f"{size_mb:.1f} MB file, {os.cpu_count()} CPUs\n")
+        print(f"{'Workers':>8} {'Comp MB/s':>10} {'Speedup':>8} {'Decomp MB/s':>12} {'Speedup':>8}")
+        baseline = None
+        for workers in WORKER_COUNTS:
+            start = time.perf_counter()
+            compress_blocks(src, packed, workers)
+            compress_seconds = time.perf_counter() - start
+            start = time.perf_counter()
+            decompress_blocks(packed, out, workers)
+            decompress_seconds = time.perf_counter() - start
+            baseline = baseline or (compress_seconds, decompress_seconds)
+            print(f"{workers:>8} {size_mb / compress_seconds:>10.2f} {baseline[0] / compress_seconds:>8.2f} "
+                  f"{size_mb / decompress_seconds:>12.2f} {baseline[1] / decompress_seconds:>8.2f}")
+
+
+def bench_random_access(documents):
+    """
+    Times random reads from a compressed archive with HuffmanArchive, which decodes only the
+    frames covering each read, against decompressing the whole file once.
+    """
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        src, packed, out = (os.path.join(tmp, name) for name in ("input.txt", "input.hufb", "output.txt"))
+        with open(src, "w", encoding="latin-1") as f:
+            f.writelines(documents)
+        with open(src, "rb") as f:
+            original = f.read()
+        compress_blocks(src, packed)
+        print("\n--- Random access into a compressed archive ---\n")
+        print(f"{len(original) / 2**20:.1f} MB file, {RANDOM_READS} reads of {RANDOM_READ_BYTES} bytes\n")
+
+        start = time.perf_counter()
+        decompress_blocks(packed, out, workers=1)
+        full_seconds = time.perf_counter() - start
+        with HuffmanArchive(packed) as archive:
+            starts = [rng.randrange(len(archive) - RANDOM_READ_BYTES) for _ in range(RANDOM_READS)]
+            start = time.perf_counter()
+            for offset in starts:
+                assert archive.read(offset, RANDOM_READ_BYTES) == original[offset:offset + RANDOM_READ_BYTES]
+            read_seconds = (time.perf_counter() - start) / RANDOM_READS
+        print(f"Full decompression:   {full_seconds * 1000:>10.1f} ms")
+        print(f"One random read:      {read_seconds * 1000:>10.2f} ms ({full_seconds / read_seconds:.0f}x faster)")
+
+
+def parse_size(text):
+    # "64K" -> 65536; accepts a plain byte count or a K, M or G suffix (powers of 1024).
+    units = {"K": 2**10, "M": 2**20, "G": 2**30}
+    suffix = text[-1:].upper()
+    size = int(text[:-1]) * units[suffix] if suffix in units else int(text)
+    if size <= 0:
+        raise ValueError(f"benchmark sizes must be positive, got {text!r}")
+    return size
+
+
+def iter_corpus(corpus, size, seed=0):
+    """
+    Yields `size` bytes of a synthetic or realistic corpus in chunks of at most FILE_CHUNK_BYTES:
+    uniform random bytes, Zipf-distributed bytes, English-like text (common words with Zipfian
+    word frequencies) or real machine code (the running Python executable, repeated).
+    """
+    rng = random.Random(seed)
+    if corpus == "binary":
+        with open(sys.executable, "rb") as f:
+            source = f.read()
+        stream = itertools.cycle([source])
+    elif corpus == "uniform":
+        stream = iter(lambda: rng.randbytes(FILE_CHUNK_BYTES), None)
+    elif corpus == "zipf":
+        cum_weights = list(itertools.accumulate(1 / rank for rank in range(1, 257)))
+        stream = iter(lambda: bytes(rng.choices(range(256), cum_weights=cum_weights, k=FILE_CHUNK_BYTES)), None)
+    elif corpus == "english":
+        cum_weights = list(itertools.accumulate(1 / rank for rank in range(1, len(ENGLISH_WORDS) + 1)))
+
+        def sentence():
+            words = rng.choices(ENGLISH_WORDS, cum_weights=cum_weights, k=rng.randint(4, 16))
+            return " ".join(words).capitalize() + rng.choice((". ", ". ", ", ", "? ", ".\n"))
+        stream = iter(lambda: "".join(sentence() for _ in range(2000)).encode("latin-1"), None)
+    else:
+        raise ValueError(f"unknown corpus {corpus!r}")
+    remaining = size
+    pending = b""
+    while remaining:
+        if not pending:
+            pending = next(stream)
+        piece = pending[:min(remaining, FILE_CHUNK_BYTES)]
+        pending = pending[len(piece):]
+        remaining -= len(piece)
+        yield piece
+
+
+def _read_file_chunks(path):
+    with open(path, "rb") as f:
+        yield from iter(lambda: f.read(FILE_CHUNK_BYTES), b"")
+
+
+def write_corpus(corpus, size, path):
+    # Writes a corpus to path and returns its CRC-32, for checking the decoded output.
+    checksum = 0
+    with open(path, "wb") as f:
+        for chunk in iter_corpus(corpus, size):
+            f.write(chunk)
+            checksum = zlib.crc32(chunk, checksum)
+    return checksum
+
+
+def run_suite_case(corpus, size, src, checksum):
+    """
+    Measures one corpus file; runs in a fresh worker process so its peak RSS is its own.
+    Build = counting frequencies and building the canonical codes; encode and decode stream
+    through files in FILE_CHUNK_BYTES chunks.
+    """
+    packed = src + ".huf"
+    repeats = max(1, SUITE_MIN_BYTES // size)
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        frequencies = {}
+        for chunk in _read_file_chunks(src):
+            for char, freq in byte_frequencies(chunk).items():
+                frequencies[char] = frequencies.get(char, 0) + freq
+        _, codes = huffman_codes_from_frequencies(frequencies, canonical=True)
+    build_seconds = (time.perf_counter() - start) / repeats
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        with open(packed, "wb") as f:
+            text_chunks = (chunk.decode("latin-1") for chunk in _read_file_chunks(src))
+            for piece in iter_encode_packed(text_chunks, codes):
+                f.write(piece)
+    encode_seconds = (time.perf_counter() - start) / repeats
+    bit_length = sum(freq * len(codes[char]) for char, freq in frequencies.items())
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        decoded_checksum = 0
+        for text in iter_decode_packed(_read_file_chunks(packed), bit_length, codes):
+            decoded_checksum = zlib.crc32(text.encode("latin-1"), decoded_checksum)
+    decode_seconds = (time.perf_counter() - start) / repeats
+    if decoded_checksum != checksum:
+        raise AssertionError(f"{corpus} {size}: decoded data does not match the input")
+
+    compressed_bytes = len(write_header(codes)) + (bit_length + 7) // 8
+    entropy = -sum(freq / size * math.log2(freq / size) for freq in frequencies.values())
+    os.remove(packed)
+    size_mb = size / 2**20
+    return {
+        "corpus": corpus,
+        "size_bytes": size,
+        "build_mb_s": size_mb / build_seconds,
+        "encode_mb_s": size_mb / encode_seconds,
+        "decode_mb_s": size_mb / decode_seconds,
+        "peak_rss_mb": peak_rss_mb(),
+        "compressed_bytes": compressed_bytes,
+        "ratio": compressed_bytes / size,
+        "bits_per_byte": bit_length / size,
+        "entropy_bits_per_byte": entropy,
+        "entropy_ratio": entropy / 8,
+    }
+
+
+def _git_commit():
+    # The commit the benchmark ran against, or None outside a git checkout.
+    try:
+        result = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)))
+    except OSError:
+        return None
+    return result.stdout.strip() or None
+
+
+def bench_suite(sizes, json_path=SUITE_JSON):
+    """
+    Runs every corpus at every size, prints a table and writes all results to json_path
+    (with the commit, Python version and machine, so runs can be compared across versions).
+    """
+    print("\n--- Throughput suite ---\n")
+    print(f"{'Corpus':<9} {'Size':>12} {'Build MB/s':>11} {'Enc MB/s':>9} {'Dec MB/s':>9} {'Peak MB':>8} "
+          f"{'Ratio':>7} {'Bits/B':>7} {'Entropy':>8}")
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size, corpus in itertools.product(sizes, SUITE_CORPORA):
+            src = os.path.join(tmp, f"{corpus}-{size}.bin")
+            checksum = write_corpus(corpus, size, src)
+            with ProcessPoolExecutor(max_workers=1) as executor:  # A fresh process per case
+                result = executor.submit(run_suite_case, corpus, size, src, checksum).result()
+            os.remove(src)
+            results.append(result)
+            peak = f"{result['peak_rss_mb']:.1f}" if result["peak_rss_mb"] is not None else "N/A"
+            print(f"{corpus:<9} {size:>12} {result['build_mb_s']:>11.2f} {result['encode_mb_s']:>9.2f} "
+                  f"{result['decode_mb_s']:>9.2f} {peak:>8} {result['ratio']:>7.3f} "
+                  f"{result['bits_per_byte']:>7.3f} {result['entropy_bits_per_byte']:>8.3f}")
+    report = {
+        "commit": _git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "results": results,
+    }
+    with open(json_path, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {json_path}")
+
+
+def main():
+    if sys.argv[1:2] == ["suite"]:
+        args = sys.argv[2:]
+        json_path = SUITE_JSON
+        if "--json" in args:
+            position = args.index("--json")
+            json_path = args[position + 1]
+            del args[position:position + 2]
+        bench_suite([parse_size(arg) for arg in args or DEFAULT_SUITE_SIZES], json_path)
+        return
+    bench_parallel_encoding(make_documents(DOCUMENTS, DOCUMENT_CHARS))
+    bench_decoding(make_documents(1, DECODE_CHARS, seed=1)[0])
+    bench_adaptive(make_documents(1, ADAPTIVE_CHARS, seed=2)[0])
+    bench_block_parallel(make_documents(BLOCK_FILE_DOCUMENTS, 2**20, seed=3))
+    bench_random_access(make_documents(BLOCK_FILE_DOCUMENTS, 2**20, seed=3))
+
+
+if __name__ == "__main__":
+    main()
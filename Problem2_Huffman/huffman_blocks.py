@@ -0,0 +1,271 @@
+# huffman_blocks.py
+#
+# Block-parallel, seekable Huffman compression of files.
+# The input is split into blocks of BLOCK_BYTES that are processed across a process pool.
+# Workers count each block's byte frequencies, the parent merges them into one canonical code
+# table, and workers then encode (or decode) whole blocks at once; every worker reads its own
+# block straight from the file, so only the code table and the encoded data travel between
+# processes.
+#
+# Blocks are stored as frames of FRAME_BYTES input bytes. A frame starts on a byte boundary
+# and on a symbol boundary, so it can be decoded on its own; the index at the end of the file
+# records where every frame starts, in encoded bits and in original bytes (symbols). That is
+# what lets HuffmanArchive read any byte range by decoding only the frames that cover it.
+# Usage: python huffman_blocks.py compress|decompress <input> <output> [workers]
+#
+# File format:
+#     BLOCK_MAGIC
+#     code header (write_header)
+#     encoded frames, each padded to a whole byte
+#     frame index: one INDEX_ENTRY per frame (bit offset, symbol offset, bit length)
+#     FOOTER: offset of the frame index, total symbols, BLOCK_MAGIC
+
+import mmap
+import os
+import struct
+import sys
+import time
+from bisect import bisect_right
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from huffman_encoder import (FILE_HEADER_BYTES, build_decode_table, byte_frequencies, encode_packed,
+                             huffman_codes_from_frequencies, iter_decode_packed, peak_rss_mb, read_header,
+                             write_header)
+
+BLOCK_BYTES = 1 << 20  # Input bytes per task handed to a worker process
+FRAME_BYTES = 1 << 16  # Input bytes per independently decodable frame (the random-access granularity)
+READ_CHUNK_BYTES = 4096  # Encoded bytes fed to the decoder at a time by HuffmanArchive.read
+BLOCK_MAGIC = b"HUFB"
+INDEX_ENTRY = struct.Struct("<QQQ")  # Frame start in bits from the file start, first symbol, length in bits
+FOOTER = struct.Struct("<QQ4s")
+
+
+def _bounded_map(executor, fn, *iterables, window):
+    # Like executor.map, but with at most `window` tasks in flight, so finished blocks waiting
+    # for an earlier, slower one cannot pile up in memory on a huge file.
+    pending = deque()
+    for args in zip(*iterables):
+        if len(pending) >= window:
+            yield pending.popleft().result()
+        pending.append(executor.submit(fn, *args))
+    while pending:
+        yield pending.popleft().result()
+
+
+def _read_range(path, start, length):
+    with open(path, "rb") as f:
+        f.seek(start)
+        return f.read(length)
+
+
+def _count_block(path, start, length):
+    # Worker: byte frequencies of one block of the input.
+    return byte_frequencies(_read_range(path, start, length))
+
+
+def _encode_block(path, start, length, huffman_codes, frame_size):
+    # Worker: one block of the input as a list of (packed bytes, bit length, symbols), one per frame.
+    text = _read_range(path, start, length).decode("latin-1")
+    frames = []
+    for offset in range(0, len(text), frame_size):
+        frame = text[offset:offset + frame_size]
+        encoded, bit_length = encode_packed(frame, huffman_codes)
+        frames.append((bytes(encoded), bit_length, len(frame)))
+    return frames
+
+
+def _decode_block(path, start, bit_lengths, huffman_codes):
+    # Worker: consecutive frames starting at byte `start` back to the original bytes.
+    data = _read_range(path, start, sum((bits + 7) // 8 for bits in bit_lengths))
+    table = build_decode_table(huffman_codes)
+    pieces = []
+    offset = 0
+    for bit_length in bit_lengths:
+        size = (bit_length + 7) // 8
+        pieces.extend(iter_decode_packed((data[offset:offset + size],), bit_length, huffman_codes, table=table))
+        offset += size
+    return "".join(pieces).encode("latin-1")
+
+
+def compress_blocks(src_path, dst_path, workers=None, block_size=BLOCK_BYTES, max_code_length=None,
+                    frame_size=FRAME_BYTES):
+    """
+    Compresses a file block by block on a pool of `workers` processes (default: one per CPU)
+    and returns (input_bytes, output_bytes).
+    """
+    if block_size % frame_size:
+        raise ValueError("block_size must be a multiple of frame_size")
+    size = os.path.getsize(src_path)
+    starts = range(0, size, block_size)
+    lengths = [min(block_size, size - start) for start in starts]
+    paths = [src_path] * len(lengths)
+
+    window = 2 * (workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Merge per-block histograms in block order, which keeps the overall first-seen order
+        frequencies = {}
+        for block_frequencies in executor.map(_count_block, paths, starts, lengths):
+            for char, freq in block_frequencies.items():
+                frequencies[char] = frequencies.get(char, 0) + freq
+        _, huffman_codes = huffman_codes_from_frequencies(frequencies, True, max_code_length)
+
+        index = bytearray()
+        symbol_offset = 0
+        with open(dst_path, "wb") as dst:
+            dst.write(BLOCK_MAGIC + write_header(huffman_codes))
+            blocks = _bounded_map(executor, _encode_block, paths, starts, lengths, [huffman_codes] * len(lengths),
+                                  [frame_size] * len(lengths), window=window)
+            for frames in blocks:
+                for encoded, bit_length, symbols in frames:
+                    index += INDEX_ENTRY.pack(dst.tell() * 8, symbol_offset, bit_length)
+                    dst.write(encoded)
+                    symbol_offset += symbols
+            index_offset = dst.tell()
+            dst.write(index)
+            dst.write(FOOTER.pack(index_offset, symbol_offset, BLOCK_MAGIC))
+            return size, dst.tell()
+
+
+class HuffmanArchive:
+    """
+    Random-access reader for files written by compress_blocks. The file is memory-mapped and
+    only the pages that are used get read: read(start, length) bisects the frame index by
+    symbol offset and decodes just the frames that overlap the range, stopping as soon as it
+    has enough bytes.
+    """
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        try:
+            if os.fstat(self._file.fileno()).st_size < len(BLOCK_MAGIC) + FOOTER.size:
+                raise ValueError("not a Huffman block file")
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+        try:
+            self._open_index()
+        except Exception:
+            self._mmap.close()
+            self._file.close()
+            raise
+        self._table = build_decode_table(self.codes)
+
+    def _open_index(self):
+        data = self._mmap
+        index_offset, self._symbols, magic = FOOTER.unpack_from(data, len(data) - FOOTER.size)
+        index_bytes = len(data) - FOOTER.size - index_offset
+        if data[:len(BLOCK_MAGIC)] != BLOCK_MAGIC or magic != BLOCK_MAGIC or index_bytes < 0:
+            raise ValueError("not a Huffman block file")
+        if index_bytes % INDEX_ENTRY.size:
+            raise ValueError("corrupt Huffman block index")
+        self.codes, _ = read_header(data[:len(BLOCK_MAGIC) + FILE_HEADER_BYTES], len(BLOCK_MAGIC))
+        self._index_offset = index_offset
+        self._frames = index_bytes // INDEX_ENTRY.size
+        if self._frames:
+            bit_offset, symbol_offset, bit_length = self.frame(self._frames - 1)
+            if bit_offset + bit_length > index_offset * 8 or symbol_offset >= self._symbols:
+                raise ValueError("corrupt Huffman block index")
+
+    def close(self):
+        self._mmap.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # Return the size of the original file in bytes.
+    def __len__(self):
+        return self._symbols
+
+    def frame_count(self):
+        return self._frames
+
+    # Return (bit_offset, symbol_offset, bit_length) for frame i.
+    def frame(self, i):
+        return INDEX_ENTRY.unpack_from(self._mmap, self._index_offset + i * INDEX_ENTRY.size)
+
+    # Return `length` bytes of the original file starting at byte `start` (fewer at the end of the file).
+    def read(self, start, length):
+        if start < 0 or length < 0:
+            raise ValueError("start and length must be non-negative")
+        end = min(start + length, self._symbols)
+        if start >= end:
+            return b""
+        first = bisect_right(range(self._frames), start, key=lambda i: self.frame(i)[1]) - 1
+        pieces = []
+        for i in range(first, self._frames):
+            bit_offset, symbol_offset, bit_length = self.frame(i)
+            if symbol_offset >= end:
+                break
+            byte_offset = bit_offset // 8
+            stop = byte_offset + (bit_length + 7) // 8
+            chunks = (self._mmap[pos:min(pos + READ_CHUNK_BYTES, stop)]
+                      for pos in range(byte_offset, stop, READ_CHUNK_BYTES))
+            decoded = 0  # Symbols of this frame decoded so far
+            for text in iter_decode_packed(chunks, bit_length, self.codes, table=self._table):
+                pieces.append(text[max(start - symbol_offset - decoded, 0):end - symbol_offset - decoded])
+                decoded += len(text)
+                if symbol_offset + decoded >= end:
+                    break
+        return "".join(pieces).encode("latin-1")
+
+
+def decompress_blocks(src_path, dst_path, workers=None, block_size=BLOCK_BYTES):
+    """
+    Decompresses a file written by compress_blocks, decoding runs of frames covering about
+    block_size input bytes in parallel. Returns (input_bytes, output_bytes).
+    """
+    with HuffmanArchive(src_path) as archive:
+        huffman_codes = archive.codes
+        frames = [archive.frame(i) for i in range(archive.frame_count())]
+    size = os.path.getsize(src_path)
+
+    # Group consecutive frames into tasks of about block_size input bytes each
+    tasks = []  # (first symbol offset, first byte offset, [bit length of each frame])
+    for bit_offset, symbol_offset, bit_length in frames:
+        if not tasks or symbol_offset - tasks[-1][0] >= block_size:
+            tasks.append((symbol_offset, bit_offset // 8, []))
+        tasks[-1][2].append(bit_length)
+
+    window = 2 * (workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as executor, open(dst_path, "wb") as dst:
+        decoded = _bounded_map(executor, _decode_block, [src_path] * len(tasks), [task[1] for task in tasks],
+                               [task[2] for task in tasks], [huffman_codes] * len(tasks), window=window)
+        for data in decoded:
+            dst.write(data)
+        return size, dst.tell()
+
+
+def run_block_command(command, src_path, dst_path, workers=None):
+    """
+    Runs block-parallel `compress` or `decompress` and reports throughput and peak memory.
+    """
+    start = time.perf_counter()
+    if command == "compress":
+        read_bytes, written_bytes = compress_blocks(src_path, dst_path, workers)
+        original_bytes = read_bytes
+    else:
+        read_bytes, written_bytes = decompress_blocks(src_path, dst_path, workers)
+        original_bytes = written_bytes
+    seconds = time.perf_counter() - start
+    peak, worker_peak = peak_rss_mb(), peak_rss_mb(children=True)
+
+    print(f"{command.capitalize()}ed {src_path} ({read_bytes} bytes) -> {dst_path} ({written_bytes} bytes)")
+    print(f"Workers:          {workers or os.cpu_count()}")
+    if original_bytes > 0:
+        print(f"Throughput:       {original_bytes / 2**20 / max(seconds, 1e-9):.2f} MB/s ({seconds:.3f} s)")
+    if peak is not None:
+        worker_text = f"{worker_peak:.1f} MB" if worker_peak is not None else "N/A"
+        print(f"Peak RSS:         {peak:.1f} MB (largest worker {worker_text})")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) in (4, 5) and sys.argv[1] in ("compress", "decompress"):
+        run_block_command(*sys.argv[1:4], workers=int(sys.argv[4]) if len(sys.argv) == 5 else None)
+    else:
+        print("Usage: python huffman_blocks.py compress|decompress <input> <output> [workers]")
+        sys.exit(2)
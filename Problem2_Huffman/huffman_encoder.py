@@ -1,5 +1,17 @@
 # Reference: https://www.w3schools.com/dsa/dsa_ref_huffman_coding.php
 
+import heapq
+import sys
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+
+try:
+    import numpy  # Optional: vectorized byte counting in byte_frequencies
+except ImportError:
+    numpy = None
+
 # Node class; stores a key(char) and its frequency
 class Node:
     def __init__(self, char=None, freq=0):
@@ -9,44 +21,85 @@ class Node:
         self.right = None
 
 
-nodes = []  # Stores nodes for building Huffman tree
+# Count occurences of characters in word; returns a {char : freq} dictionary in first-seen order
+# (Counter counts in C and keeps insertion order, so the result matches a plain dict loop)
+def calculate_frequencies(word):
+    return dict(Counter(word))
 
 
-# Count occurences of characters in word, and append to nodes list
-def calculate_frequencies(word):
-    frequencies = {}
-    for char in word:
-        if char in frequencies:
-            frequencies[char] += 1
-        else:
-            frequencies[char] = 1
-    for unique_char in frequencies:
-        nodes.append(Node(unique_char, frequencies[unique_char]))
+def byte_frequencies(data):
+    """
+    Counts the bytes of a bytes-like object; returns {chr(byte) : freq} in first-seen order,
+    the same result as calculate_frequencies(data.decode("latin-1")), which is the fallback.
+    With NumPy installed the histogram is a single bincount over the buffer; the first-seen
+    order is then recovered with one find() per distinct byte, each stopping at its first match.
+    """
+    data = data if isinstance(data, bytes) else bytes(data)
+    if numpy is None:
+        return calculate_frequencies(data.decode("latin-1"))  # Counting str is faster than counting ints
+    counts = numpy.bincount(numpy.frombuffer(data, dtype=numpy.uint8), minlength=256).tolist()
+    present = sorted((data.find(bytes((byte,))), byte) for byte in range(256) if counts[byte])
+    return {chr(byte): counts[byte] for _, byte in present}
 
 
-# Manual impl of bubble sort that sorts Nodes based on freq value
-# Bubble sort algorithm is chosen, to decrease code complexity
-def bubble_sort_nodes(list):
-    n = len(list)
-    for i in range(n):
-        for j in range(0, n - i - 1):
-            if list[j].freq > list[j + 1].freq:
-                list[j], list[j + 1] = list[j + 1], list[j]
+def build_huffman_tree(frequencies):
+    """
+    Builds the Huffman tree for a {char : freq} dictionary and returns its root (None if empty).
+    Repeatedly merges the two lowest-frequency nodes, taken from a min-heap in O(k log k),
+    or in O(k) with two queues when the leaves are already in ascending frequency order.
 
+    Ties are broken by creation order: leaves in the order their characters first appear,
+    then merged nodes in the order they were made. The result is deterministic, so the same
+    input always gives the same codes.
+    """
+    nodes = [Node(char, freq) for char, freq in frequencies.items()]
+    if all(a.freq <= b.freq for a, b in zip(nodes, nodes[1:])):
+        return build_huffman_tree_sorted(nodes)
 
-def build_huffman_tree():
-    while len(nodes) > 1:
-        bubble_sort_nodes(nodes)  # Sort nodes in ascending order
-        left = nodes.pop(0)
-        right = nodes.pop(0)
+    heap = [(node.freq, order, node) for order, node in enumerate(nodes)]
+    heapq.heapify(heap)
+    order = len(heap)
+    while len(heap) > 1:
+        _, _, left = heapq.heappop(heap)
+        _, _, right = heapq.heappop(heap)
 
         merged = Node(freq=left.freq + right.freq)
         merged.left = left
         merged.right = right
 
-        nodes.append(merged)
+        heapq.heappush(heap, (merged.freq, order, merged))
+        order += 1
+
+    return heap[0][2] if heap else None  # Return the root
 
-    return nodes[0]  # Return the root
+
+def build_huffman_tree_sorted(leaves):
+    """
+    Two-queue Huffman construction for leaves already sorted by ascending frequency, in O(k).
+    Merged nodes are created in non-decreasing frequency order, so a plain FIFO queue keeps
+    them sorted; each step takes the two smallest fronts of the two queues, preferring the
+    leaf queue on ties (the same tie-break as build_huffman_tree).
+    """
+    leaf_queue = deque(leaves)
+    merged_queue = deque()
+
+    def pop_smallest():
+        if not merged_queue or (leaf_queue and leaf_queue[0].freq <= merged_queue[0].freq):
+            return leaf_queue.popleft()
+        return merged_queue.popleft()
+
+    while len(leaf_queue) + len(merged_queue) > 1:
+        left = pop_smallest()
+        right = pop_smallest()
+
+        merged = Node(freq=left.freq + right.freq)
+        merged.left = left
+        merged.right = right
+
+        merged_queue.append(merged)
+
+    remaining = merged_queue or leaf_queue
+    return remaining[0] if remaining else None  # Return the root
 
 
 # Traverses Huffman tree to generate Huffman codes for each char
@@ -54,24 +107,128 @@ def generate_huffman_codes(node, current_code, codes):
     if not node:
         return
 
-    if node.char:
-        codes[node.char] = current_code
+    if node.char is not None:
+        # A lone leaf at the root still needs a 1-bit code, or its text would encode to nothing
+        codes[node.char] = current_code or "0"
 
     # Recursively generate code, adding 0 for left and 1 for right (traversal)
     generate_huffman_codes(node.left, current_code + "0", codes)
     generate_huffman_codes(node.right, current_code + "1", codes)
 
 
-def huffman_encoding(string):
-    global nodes
-    nodes = []
-    calculate_frequencies(string)
-    root = build_huffman_tree()
+def canonical_codes(code_lengths):
+    """
+    Assigns canonical Huffman codes from a {char : code length} dictionary.
+    Symbols are ordered by (length, char) and given consecutive binary values, so the codes
+    are fully determined by the lengths; a decoder needs nothing but the lengths to rebuild them.
+    """
+    codes = {}
+    code = 0
+    previous_length = 0
+    for char, length in sorted(code_lengths.items(), key=lambda item: (item[1], item[0])):
+        code <<= length - previous_length
+        codes[char] = format(code, f"0{length}b")
+        code += 1
+        previous_length = length
+    return codes
+
+
+def limited_code_lengths(frequencies, max_length):
+    """
+    Computes optimal code lengths of at most max_length bits for a {char : freq} dictionary,
+    with the package-merge algorithm, in O(k * max_length) merge steps; returns {char : length}.
+
+    Every symbol starts as a coin of its frequency. Each round pairs up the cheapest items of
+    the previous list into packages and merges them with a fresh copy of the coins; after
+    max_length - 1 rounds the 2k - 2 cheapest items are the optimal selection, and a symbol's
+    code length is the number of those items it appears in.
+    """
+    if len(frequencies) <= 1:
+        return {char: 1 for char in frequencies}
+    if max_length < 1 or (1 << max_length) < len(frequencies):
+        raise ValueError(f"max_code_length {max_length} is too small for {len(frequencies)} symbols")
+    symbols = sorted(frequencies, key=frequencies.get)
+    coins = [(frequencies[char], (index,)) for index, char in enumerate(symbols)]
+    items = coins
+    for _ in range(max_length - 1):
+        packages = [(items[i][0] + items[i + 1][0], items[i][1] + items[i + 1][1])
+                    for i in range(0, len(items) - 1, 2)]
+        items = list(heapq.merge(coins, packages, key=lambda item: item[0]))  # Coins first on ties
+    lengths = [0] * len(symbols)
+    for _, members in items[:2 * len(symbols) - 2]:
+        for index in members:
+            lengths[index] += 1
+    return {char: lengths[index] for index, char in enumerate(symbols)}
+
+
+def tree_from_codes(huffman_codes, frequencies):
+    # Rebuilds the tree a prefix code describes (for visualization), with subtree frequencies.
+    root = Node()
+    for char, code in huffman_codes.items():
+        node = root
+        node.freq += frequencies[char]
+        for bit in code:
+            branch = "left" if bit == "0" else "right"
+            if getattr(node, branch) is None:
+                setattr(node, branch, Node())
+            node = getattr(node, branch)
+            node.freq += frequencies[char]
+        node.char = char
+    return root
+
+
+# Builds the tree and codes for a string. Uses no shared state, so it is safe to call from many threads.
+# With canonical=True the codes are reassigned canonically; they have the same lengths as the
+# tree's codes, so the compression is identical, and root is rebuilt to follow the new codes.
+# max_code_length caps the code length (e.g. 15 bits, as in DEFLATE); see huffman_codes_from_frequencies.
+# Pass frequencies if the string's histogram is already known, so it is not counted twice.
+def huffman_encoding(string, canonical=False, max_code_length=None, frequencies=None):
+    if frequencies is None:
+        frequencies = calculate_frequencies(string)
+    return huffman_codes_from_frequencies(frequencies, canonical, max_code_length)
+
+
+# Builds the tree and codes for a {char : freq} dictionary; returns (root, codes) like huffman_encoding.
+# If the Huffman tree has codes longer than max_code_length, the lengths come from
+# limited_code_lengths instead. Whenever the codes are reassigned (canonical or limited), root is
+# rebuilt with tree_from_codes so the tree drawn by the visualizer matches the code table.
+def huffman_codes_from_frequencies(frequencies, canonical=False, max_code_length=None):
+    root = build_huffman_tree(frequencies)
     huffman_codes = {}  # {char : code} dictionary format
     generate_huffman_codes(root, "", huffman_codes)
+    if max_code_length is not None and max(map(len, huffman_codes.values()), default=0) > max_code_length:
+        huffman_codes = canonical_codes(limited_code_lengths(frequencies, max_code_length))
+        root = tree_from_codes(huffman_codes, frequencies)
+    elif canonical:
+        reassigned = canonical_codes({char: len(code) for char, code in huffman_codes.items()})
+        if reassigned != huffman_codes:
+            huffman_codes = reassigned
+            root = tree_from_codes(huffman_codes, frequencies)
     return root, huffman_codes  # Returns root for visualization class
 
 
+def encode_document(document):
+    """
+    Encodes one document and returns (encoded_bytes, bit_length, huffman_codes).
+    Module-level so that process pools can pickle it.
+    """
+    _, huffman_codes = huffman_encoding(document)
+    encoded, bit_length = encode_packed(document, huffman_codes)
+    return bytes(encoded), bit_length, huffman_codes
+
+
+def encode_documents(documents, workers=None, use_processes=False):
+    """
+    Encodes many independent documents in parallel and returns their
+    (encoded_bytes, bit_length, huffman_codes) tuples in input order.
+    Threads share the interpreter (and its GIL); use_processes=True runs the documents in
+    separate processes instead, which scales across cores for CPU-bound batches.
+    """
+    executor_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    with executor_class(max_workers=workers) as executor:
+        return list(executor.map(encode_document, documents))
+
+
 def huffman_decoding(encoded_string, huffman_codes):
     """
     Decoding:
@@ -96,11 +253,414 @@ def huffman_decoding(encoded_string, huffman_codes):
     return "".join(decoded_chars)
 
 
-def display_results(word, codes, encoded_str, decoded_str, show_table=True, show_results=True, show_analysis=True):
+PACK_CHUNK_CHARS = 1 << 16  # Characters converted to bits at a time by encode_packed
+
+
+def encode_packed(string, huffman_codes):
+    """
+    Encodes string into real packed bits and returns (bytearray, bit_length).
+    Bits are stored most-significant first; the last byte is padded with 0 bits, so
+    bit_length (not len(data) * 8) says where the encoded text ends.
+    """
+    data = bytearray()
+    packer = iter_encode_packed((string,), huffman_codes)
+    while True:
+        try:
+            data += next(packer)
+        except StopIteration as done:
+            return data, done.value
+
+
+def iter_encode_packed(chunks, huffman_codes):
+    """
+    Encodes an iterable of string chunks as one continuous bit stream, yielding packed bytes
+    as they complete; bits that do not fill a byte are carried into the next chunk, and only
+    the very last byte is padded. The generator's return value is the total bit length.
+
+    Each slice of PACK_CHUNK_CHARS characters has its codes joined into a short '0'/'1'
+    string and converted to bytes in C with int(bits, 2), so the 8x-larger bit string
+    never exists for the whole input at once.
+    """
+    pending = ""  # Bits left over from the previous slice (fewer than 8)
+    bit_length = 0
+    lookup = huffman_codes.__getitem__
+    for chunk in chunks:
+        for start in range(0, len(chunk), PACK_CHUNK_CHARS):
+            bits = pending + "".join(map(lookup, chunk[start:start + PACK_CHUNK_CHARS]))
+            bit_length += len(bits) - len(pending)
+            whole = len(bits) - len(bits) % 8
+            if whole:
+                yield int(bits[:whole], 2).to_bytes(whole // 8, "big")
+            pending = bits[whole:]
+    if pending:
+        yield bytes([int(pending.ljust(8, "0"), 2)])
+    return bit_length
+
+
+DECODE_TABLE_BITS = 12  # Most bits of input resolved by one decode table lookup
+DECODE_TABLE_CACHE_SIZE = 32  # Decode tables kept for reuse by iter_decode_packed, one per code set
+
+
+def build_decode_table(huffman_codes, table_bits=DECODE_TABLE_BITS):
+    """
+    Builds the lookup table used by decode_packed.
+    Entry i describes what the next table_bits bits (as the integer i) decode to:
+    (symbols, bits_used), where symbols holds every complete code that fits in those bits,
+    so one lookup can emit several short symbols. bits_used == 0 marks a prefix of a code
+    longer than table_bits, which the decoder resolves bit by bit.
+    table_bits is lowered to the longest code length if every code is shorter, so small code
+    sets get small tables; the table has 2 ** table_bits entries either way.
+    """
+    table_bits = min(table_bits, max(map(len, huffman_codes.values()), default=1))
+    size = 1 << table_bits
+    mask = size - 1
+    # First symbol only: every index starting with a code of length n <= table_bits
+    first = [None] * size
+    for char, code in huffman_codes.items():
+        length = len(code)
+        if length <= table_bits:
+            start = int(code, 2) << (table_bits - length)
+            for index in range(start, start + (1 << (table_bits - length))):
+                first[index] = (char, length)
+    table = []
+    for index in range(size):
+        if first[index] is None:
+            table.append(("", 0))
+            continue
+        symbols, used = first[index]
+        while True:
+            # The remaining bits, padded with zeros, name the next code if it fits entirely
+            following = first[(index << used) & mask]
+            if following is None or used + following[1] > table_bits:
+                break
+            symbols += following[0]
+            used += following[1]
+        table.append((symbols, used))
+    return table
+
+
+@lru_cache(maxsize=DECODE_TABLE_CACHE_SIZE)
+def _cached_decode_table(code_items, table_bits):
+    # build_decode_table for a frozenset of (char, code) pairs, so repeated messages with the
+    # same codes (e.g. many small documents) do not rebuild the table every time.
+    return build_decode_table(dict(code_items), table_bits)
+
+
+def _decode_symbol(acc, nbits, available, first_length, code_to_char):
+    # Decodes one code from the top of the nbits-bit buffer acc, trying lengths in order.
+    for length in range(first_length, available + 1):
+        char = code_to_char.get((length, acc >> (nbits - length)))
+        if char is not None:
+            return char, length
+    raise ValueError("packed data does not match the Huffman codes")
+
+
+def iter_decode_packed(chunks, bit_length, huffman_codes, table_bits=DECODE_TABLE_BITS, table=None):
+    """
+    Decodes the first bit_length bits of packed data supplied as an iterable of bytes-like
+    chunks, yielding the decoded text one piece per chunk.
+    Each step looks up the next table_bits bits in a table from build_decode_table and emits
+    one or more symbols at once; only codes longer than table_bits fall back to a
+    bit-by-bit search. Tables are cached per code set; callers can also pass one in.
+    """
+    if bit_length == 0:
+        return
+    longest = max(map(len, huffman_codes.values()))
+    if table is None:
+        # Entries wider than the longest code only pay off on long inputs (several symbols
+        # per lookup); for a short message, building them would cost more than decoding it.
+        table_bits = min(table_bits, max(longest, (bit_length >> 4).bit_length()))
+        table = _cached_decode_table(frozenset(huffman_codes.items()), table_bits)
+    table_bits = len(table).bit_length() - 1  # The table may be narrower than requested
+    code_to_char = {(len(code), int(code, 2)): char for char, code in huffman_codes.items()}
+    mask = (1 << table_bits) - 1
+    need = max(table_bits, longest)  # Bits required for any one step
+    acc = nbits = 0  # Bit buffer: the low nbits bits of acc are read but not yet decoded
+    remaining = bit_length  # Encoded bits not yet decoded (the rest of the data is padding)
+
+    for chunk in chunks:
+        pieces = []
+        pos = 0
+        while True:
+            while nbits < need and pos < len(chunk):
+                refill = chunk[pos:pos + 7]
+                pos += len(refill)
+                acc = (acc << (8 * len(refill))) | int.from_bytes(refill, "big")
+                nbits += 8 * len(refill)
+            if nbits < need or remaining < need:
+                break  # Wait for the next chunk, or finish the tail below
+            symbols, used = table[(acc >> (nbits - table_bits)) & mask]
+            if not used:
+                symbols, used = _decode_symbol(acc, nbits, need, table_bits + 1, code_to_char)
+            pieces.append(symbols)
+            nbits -= used
+            remaining -= used
+            acc &= (1 << nbits) - 1
+        if pieces:
+            yield "".join(pieces)
+
+    # Tail: fewer than `need` encoded bits are left, so table entries could read into padding
+    pieces = []
+    while remaining > 0:
+        char, used = _decode_symbol(acc, nbits, min(nbits, remaining), 1, code_to_char)
+        pieces.append(char)
+        nbits -= used
+        remaining -= used
+        acc &= (1 << nbits) - 1
+    if pieces:
+        yield "".join(pieces)
+
+
+def decode_packed(data, bit_length, huffman_codes):
+    """
+    Decodes the first bit_length bits of a bytes-like object produced by encode_packed.
+    """
+    return "".join(iter_decode_packed((data,), bit_length, huffman_codes))
+
+
+def _write_varint(out, value):
+    # Appends a non-negative integer to out as a little-endian base-128 varint.
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data, offset):
+    # Reads a varint written by _write_varint; returns (value, offset just past it).
+    value = shift = 0
+    while True:
+        if offset >= len(data):
+            raise ValueError("truncated Huffman data")
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+def write_header(huffman_codes):
+    """
+    Serializes canonical Huffman codes (see canonical_codes) into a compact header:
+
+        max code length L (1 byte)
+        L varints: how many symbols have each code length 1..L
+        each symbol's code point as a varint, in canonical order; within a length the
+        code points ascend, so all but the first are stored as the gap from the previous one
+
+    Only the lengths are stored, so the codes must be canonical; raises ValueError otherwise.
+    """
+    code_lengths = {char: len(code) for char, code in huffman_codes.items()}
+    if canonical_codes(code_lengths) != huffman_codes:
+        raise ValueError("write_header() requires canonical codes")
+    max_length = max(code_lengths.values(), default=0)
+    if max_length > 255:
+        raise ValueError("code lengths above 255 bits cannot be stored")
+    by_length = [[] for _ in range(max_length + 1)]
+    for char, length in code_lengths.items():
+        by_length[length].append(ord(char))
+
+    header = bytearray([max_length])
+    for symbols in by_length[1:]:
+        _write_varint(header, len(symbols))
+    for symbols in by_length[1:]:
+        previous = 0
+        for point in sorted(symbols):
+            _write_varint(header, point - previous)
+            previous = point
+    return bytes(header)
+
+
+def read_header(data, offset=0):
+    """
+    Parses a header written by write_header starting at data[offset].
+    Returns (huffman_codes, offset just past the header).
+    """
+    if offset >= len(data):
+        raise ValueError("truncated Huffman data")
+    max_length = data[offset]
+    offset += 1
+    counts = []
+    for _ in range(max_length):
+        count, offset = _read_varint(data, offset)
+        counts.append(count)
+    # The lengths must fit a prefix code (Kraft inequality), or the codes would overflow
+    if sum(count << (max_length - length) for length, count in enumerate(counts, 1)) > 1 << max_length:
+        raise ValueError("invalid Huffman header: code lengths do not form a prefix code")
+    code_lengths = {}
+    for length, count in enumerate(counts, 1):
+        point = 0
+        for _ in range(count):
+            gap, offset = _read_varint(data, offset)
+            point += gap
+            code_lengths[chr(point)] = length
+    return canonical_codes(code_lengths), offset
+
+
+def compress(string, max_code_length=None):
+    """
+    Encodes string into one self-contained message: write_header's code lengths,
+    the bit length as a varint, then the packed bits.
+    """
+    _, huffman_codes = huffman_encoding(string, canonical=True, max_code_length=max_code_length)
+    encoded, bit_length = encode_packed(string, huffman_codes)
+    message = bytearray(write_header(huffman_codes))
+    _write_varint(message, bit_length)
+    message += encoded
+    return bytes(message)
+
+
+def decompress(data):
+    """
+    Decodes a message produced by compress, rebuilding the codes from its header.
+    """
+    huffman_codes, offset = read_header(data)
+    bit_length, offset = _read_varint(data, offset)
+    if len(data) - offset < (bit_length + 7) // 8:
+        raise ValueError("truncated Huffman data")
+    return decode_packed(memoryview(data)[offset:], bit_length, huffman_codes)
+
+
+FILE_CHUNK_BYTES = 1 << 20  # Bytes read, encoded or decoded at a time by the file commands
+FILE_HEADER_BYTES = 2048  # Upper bound on header + bit length for a byte alphabet (at most ~1.1 KB)
+
+
+def _read_chunks(f, chunk_size):
+    # Yields the file's remaining contents as latin-1 strings of chunk_size characters at most.
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk.decode("latin-1")
+
+
+def compress_file(src_path, dst_path, chunk_size=FILE_CHUNK_BYTES, max_code_length=None):
+    """
+    Compresses a file of any size in bounded memory and returns (input_bytes, output_bytes).
+    Bytes are coded as the characters chr(0)..chr(255) (latin-1). A first pass counts
+    frequencies chunk by chunk; a second pass streams the encoded bits to dst_path in the
+    same format as compress(): header, bit length, packed bits.
+    """
+    frequencies = {}
+    with open(src_path, "rb") as src:
+        for chunk in iter(lambda: src.read(chunk_size), b""):
+            for char, freq in byte_frequencies(chunk).items():
+                frequencies[char] = frequencies.get(char, 0) + freq
+        _, huffman_codes = huffman_codes_from_frequencies(frequencies, True, max_code_length)
+        header = bytearray(write_header(huffman_codes))
+        _write_varint(header, sum(freq * len(huffman_codes[char]) for char, freq in frequencies.items()))
+
+        src.seek(0)
+        with open(dst_path, "wb") as dst:
+            dst.write(header)
+            for piece in iter_encode_packed(_read_chunks(src, chunk_size), huffman_codes):
+                dst.write(piece)
+            return src.tell(), dst.tell()
+
+
+def decompress_file(src_path, dst_path, chunk_size=FILE_CHUNK_BYTES):
+    """
+    Decompresses a file written by compress_file, chunk by chunk. Returns (input_bytes, output_bytes).
+    """
+    with open(src_path, "rb") as src, open(dst_path, "wb") as dst:
+        # The header and bit length always fit in the first FILE_HEADER_BYTES bytes
+        prefix = src.read(FILE_HEADER_BYTES)
+        huffman_codes, offset = read_header(prefix)
+        bit_length, offset = _read_varint(prefix, offset)
+        src.seek(offset)
+        remaining = (bit_length + 7) // 8
+
+        def chunks():
+            nonlocal remaining
+            while remaining:
+                chunk = src.read(min(chunk_size, remaining))
+                if not chunk:
+                    raise ValueError("truncated Huffman data")
+                remaining -= len(chunk)
+                yield chunk
+
+        for text in iter_decode_packed(chunks(), bit_length, huffman_codes):
+            dst.write(text.encode("latin-1"))
+        return src.tell(), dst.tell()
+
+
+def _windows_peak_working_set_mb():
+    # Peak working set of this process in MB from GetProcessMemoryInfo, or None if the call fails.
+    import ctypes
+    from ctypes import wintypes
+
+    class ProcessMemoryCounters(ctypes.Structure):
+        _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                    ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                    ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                    ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+
+    kernel32, psapi = ctypes.WinDLL("kernel32"), ctypes.WinDLL("psapi")
+    kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+    psapi.GetProcessMemoryInfo.argtypes = [wintypes.HANDLE, ctypes.POINTER(ProcessMemoryCounters), wintypes.DWORD]
+    psapi.GetProcessMemoryInfo.restype = wintypes.BOOL
+    counters = ProcessMemoryCounters()
+    counters.cb = ctypes.sizeof(counters)
+    if not psapi.GetProcessMemoryInfo(kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb):
+        return None
+    return counters.PeakWorkingSetSize / 2**20
+
+
+def peak_rss_mb(children=False):
+    # Peak resident set size of this process (or of its largest finished child process) in MB,
+    # or None where it cannot be measured. Windows has no resource module, so there the peak
+    # working set is used instead, and child processes are not covered.
+    if sys.platform == "win32":
+        return None if children else _windows_peak_working_set_mb()
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10  # Bytes on macOS, KB elsewhere
+
+
+def run_file_command(command, src_path, dst_path, max_code_length=None):
+    """
+    Runs `compress` or `decompress` on a file and reports sizes, throughput and peak memory.
+    """
+    start = time.perf_counter()
+    if command == "compress":
+        read_bytes, written_bytes = compress_file(src_path, dst_path, max_code_length=max_code_length)
+        original_bytes = read_bytes
+    else:
+        read_bytes, written_bytes = decompress_file(src_path, dst_path)
+        original_bytes = written_bytes
+    seconds = time.perf_counter() - start
+    peak = peak_rss_mb()
+
+    print(f"{command.capitalize()}ed {src_path} ({read_bytes} bytes) -> {dst_path} ({written_bytes} bytes)")
+    if original_bytes > 0:
+        print(f"Throughput:       {original_bytes / 2**20 / max(seconds, 1e-9):.2f} MB/s ({seconds:.3f} s)")
+    print(f"Peak RSS:         {f'{peak:.1f} MB' if peak is not None else 'N/A'}")
+
+
+def bits_to_string(data, bit_length):
+    # Renders packed bits as a '0'/'1' string (for display only).
+    if bit_length == 0:
+        return ""
+    return format(int.from_bytes(data, "big"), f"0{len(data) * 8}b")[:bit_length]
+
+
+def display_results(word, codes, encoded, bit_length, decoded_str, show_table=True, show_results=True,
+                    show_analysis=True, max_code_length=None, frequencies=None):
     """
     Displays the Huffman coding results in a polished, table-based format,
-    with sections that can be toggled on or off.
+    with sections that can be toggled on or off. `encoded` is the packed output of
+    encode_packed and `bit_length` its exact length in bits. With canonical codes the
+    analysis also shows the size of the header needed to decode them, and with a
+    max_code_length it shows what the length limit costs against unlimited Huffman codes.
+    `frequencies` is the histogram the codes were built from; it is counted here if not given.
     """
+    if frequencies is None:
+        frequencies = calculate_frequencies(word)
     print("\n\n╔═══════════════════════════════╗")
     print("║   Huffman Coding Analysis     ║")
     print("╚═══════════════════════════════╝")
@@ -111,7 +671,6 @@ def display_results(word, codes, encoded_str, decoded_str, show_table=True, show
         if not codes:
             print("No character codes to display.")
         else:
-            frequencies = {char: word.count(char) for char in sorted(codes.keys())}
             char_w = max([len(c) for c in frequencies.keys()] + [len("Char")]) + 2
             freq_w = max([len(str(f)) for f in frequencies.values()] + [len("Freq")])
             code_w = max([len(c) for c in codes.values()] + [len("Code")])
@@ -128,22 +687,34 @@ def display_results(word, codes, encoded_str, decoded_str, show_table=True, show
     if show_results:
         print("\n\n--- Encoding & Decoding Results ---\n")
         print(f"Original String:  {word}")
-        print(f"Encoded String:   {encoded_str}")
+        print(f"Encoded String:   {bits_to_string(encoded, bit_length)}")
+        print(f"Encoded Bytes:    {bytes(encoded).hex(' ')}")
         print(f"Decoded String:   {decoded_str}")
 
     # --- 3. Compression Analysis ---
     if show_analysis:
         print("\n\n--- Compression Analysis ---\n")
-        original_bits = len(word) * 8
-        encoded_bits = len(encoded_str)
-        if original_bits > 0:
-            savings = (1 - (encoded_bits / original_bits)) * 100
+        original_bytes = len(word.encode("utf-8"))
+        encoded_bytes = len(encoded)
+        if original_bytes > 0:
+            savings = (1 - (encoded_bytes / original_bytes)) * 100
             savings_str = f"{savings:.2f}%"
         else:
             savings_str = "N/A"
-        print(f"Original Size:    {original_bits} bits ({len(word)} chars x 8 bits)")
-        print(f"Encoded Size:     {encoded_bits} bits")
+        print(f"Original Size:    {original_bytes} bytes ({len(word)} chars, UTF-8)")
+        print(f"Encoded Size:     {encoded_bytes} bytes ({bit_length} bits + {encoded_bytes * 8 - bit_length} padding bits)")
         print(f"Space Savings:    {savings_str}")
+        if codes and canonical_codes({char: len(code) for char, code in codes.items()}) == codes:
+            header_bytes = len(write_header(codes))
+            print(f"Header Size:      {header_bytes} bytes (code lengths for {len(codes)} symbols)")
+            print(f"Total Size:       {header_bytes + encoded_bytes} bytes")
+        if max_code_length is not None and codes:
+            _, unlimited_codes = huffman_codes_from_frequencies(frequencies)
+            unlimited_bits = sum(freq * len(unlimited_codes[char]) for char, freq in frequencies.items())
+            cost = bit_length - unlimited_bits
+            print(f"Max Code Length:  {max(map(len, codes.values()))} bits (limit {max_code_length}, "
+                  f"unlimited {max(map(len, unlimited_codes.values()))})")
+            print(f"Length Limit Cost: +{cost} bits (+{cost / unlimited_bits * 100:.2f}%) vs unlimited codes")
 
     # --- 4. Final Verification Status ---
     print("\n" + "─" * 40)
@@ -197,6 +768,8 @@ def main():
             show_table = input("Show Huffman table? (y/n): ").lower() == 'y'
             show_results = input("Show full encoding/decoding results? (y/n): ").lower() == 'y'
             show_analysis = input("Show compression analysis? (y/n): ").lower() == 'y'
+            limit = input("Max code length in bits (blank for unlimited): ").strip()
+            max_code_length = int(limit) if limit.isdigit() else None
             show_viz = False
             if visualizer_available:
                 show_viz = input("Generate tree visualization? (y/n): ").lower() == 'y'
@@ -209,19 +782,27 @@ def main():
 
             if len(set(word)) <= 1:
                 print("\n✅ Encoding complete, but no complex tree was built for a single unique character.")
-                root, huffman_codes = huffman_encoding(word) # Still run encoding
-                encoded_string = "".join(huffman_codes.get(char, '') for char in word)
-                decoded_string = huffman_decoding(encoded_string, huffman_codes)
-                display_results(word, huffman_codes, encoded_string, decoded_string, show_table, show_results, show_analysis)
+                frequencies = calculate_frequencies(word)
+                root, huffman_codes = huffman_encoding(word, canonical=True, frequencies=frequencies) # Still run encoding
+                encoded, bit_length = encode_packed(word, huffman_codes)
+                decoded_string = decode_packed(encoded, bit_length, huffman_codes)
+                display_results(word, huffman_codes, encoded, bit_length, decoded_string, show_table, show_results, show_analysis,
+                                max_code_length, frequencies)
                 if show_viz:
                     print("(Visualization skipped for single-character inputs)")
                 continue
 
             # --- Process and Display ---
-            root, huffman_codes = huffman_encoding(word)
-            encoded_string = "".join(huffman_codes[char] for char in word)
-            decoded_string = huffman_decoding(encoded_string, huffman_codes)
-            display_results(word, huffman_codes, encoded_string, decoded_string, show_table, show_results, show_analysis)
+            frequencies = calculate_frequencies(word)  # Counted once, shared by the encoder and the table
+            try:
+                root, huffman_codes = huffman_encoding(word, True, max_code_length, frequencies)
+            except ValueError as e:
+                print(f"\n❌ Error: {e}")
+                continue
+            encoded, bit_length = encode_packed(word, huffman_codes)
+            decoded_string = decode_packed(encoded, bit_length, huffman_codes)
+            display_results(word, huffman_codes, encoded, bit_length, decoded_string, show_table, show_results, show_analysis,
+                            max_code_length, frequencies)
 
             if show_viz:
                 print("\nLaunching visualization window...")
@@ -255,15 +836,14 @@ def run_test_suite(test_cases):
         else:
             try:
                 # Run the full encoding/decoding process
-                root, huffman_codes = huffman_encoding(test_str)
-                encoded_string = "".join(huffman_codes[char] for char in test_str)
-                decoded_string = huffman_decoding(encoded_string, huffman_codes)
+                root, huffman_codes = huffman_encoding(test_str, canonical=True)
+                encoded, bit_length = encode_packed(test_str, huffman_codes)
+                decoded_string = decode_packed(encoded, bit_length, huffman_codes)
 
-                if decoded_string == test_str:
+                if decoded_string == test_str and decompress(compress(test_str)) == test_str:
                     status = "✅ PASSED"
-                    original_bits = len(test_str) * 8
-                    encoded_bits = len(encoded_string)
-                    savings = (1 - (encoded_bits / original_bits)) * 100
+                    original_bytes = len(test_str.encode("utf-8"))
+                    savings = (1 - (len(encoded) / original_bytes)) * 100
                     details = f"Space Savings: {savings:.2f}%"
                     total_passed += 1
                 else:
@@ -284,4 +864,13 @@ def run_test_suite(test_cases):
 
 
 if __name__ == "__main__":
-    main()
+    if len(sys.argv) == 4 and sys.argv[1] in ("compress", "decompress"):
+        run_file_command(*sys.argv[1:])
+    elif len(sys.argv) == 5 and sys.argv[1] == "compress" and sys.argv[4].isdigit():
+        run_file_command(*sys.argv[1:4], max_code_length=int(sys.argv[4]))
+    elif len(sys.argv) > 1:
+        print("Usage: python huffman_encoder.py [compress <input> <output> [max_code_length] | "
+              "decompress <input> <output>]")
+        sys.exit(2)
+    else:
+        main()